@@ -53,6 +53,9 @@ config.set_main_option("sqlalchemy.url", DATABASE_URL)
 try:
     # Adjust this import based on where your Base is defined
     from app.models.task import Base
+    import app.models.extraction_cache  # noqa: F401  (registers table on Base.metadata)
+    import app.models.transcript_job  # noqa: F401
+    import app.models.task_collection_version  # noqa: F401
 except Exception as exc:
     raise RuntimeError(
         "Failed importing app.models.task. Ensure your models import has no side-effects "
@@ -0,0 +1,29 @@
+"""add task version
+
+Revision ID: 0b7f4e9c2a18
+Revises: 5c9e0a7d3b21
+Create Date: 2026-10-18 15:21:07.114092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b7f4e9c2a18'
+down_revision: Union[str, Sequence[str], None] = '5c9e0a7d3b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # constant default: metadata-only change, no table rewrite
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version')
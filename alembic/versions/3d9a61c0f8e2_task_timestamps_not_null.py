@@ -0,0 +1,40 @@
+"""task timestamps not null
+
+Revision ID: 3d9a61c0f8e2
+Revises: 0b7f4e9c2a18
+Create Date: 2026-10-18 18:40:51.306127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a61c0f8e2'
+down_revision: Union[str, Sequence[str], None] = '0b7f4e9c2a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keyset pagination sorts by these; a NULL would need an OR in the seek that no index can serve
+    op.execute(
+        "UPDATE tasks SET created_at = coalesce(created_at, updated_at, now()), "
+        "updated_at = coalesce(updated_at, created_at, now()) "
+        "WHERE created_at IS NULL OR updated_at IS NULL"
+    )
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(), nullable=False,
+                    existing_server_default=sa.text('now()'))
+    op.alter_column('tasks', 'updated_at', existing_type=sa.DateTime(), nullable=False,
+                    existing_server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('tasks', 'updated_at', existing_type=sa.DateTime(), nullable=True,
+                    existing_server_default=sa.text('now()'))
+    op.alter_column('tasks', 'created_at', existing_type=sa.DateTime(), nullable=True,
+                    existing_server_default=sa.text('now()'))
@@ -0,0 +1,35 @@
+"""add task collection version
+
+Revision ID: 5c9e0a7d3b21
+Revises: dd5f2a5bd04e
+Create Date: 2026-10-18 14:02:31.551870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9e0a7d3b21'
+down_revision: Union[str, Sequence[str], None] = 'dd5f2a5bd04e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_collection_version',
+    sa.Column('id', sa.SmallInteger(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # the single counter row; writers only ever UPDATE it
+    op.execute("INSERT INTO task_collection_version (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_collection_version')
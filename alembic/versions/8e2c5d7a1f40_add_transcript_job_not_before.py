@@ -0,0 +1,28 @@
+"""add transcript job not_before
+
+Revision ID: 8e2c5d7a1f40
+Revises: 3d9a61c0f8e2
+Create Date: 2026-10-18 21:14:37.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2c5d7a1f40'
+down_revision: Union[str, Sequence[str], None] = '3d9a61c0f8e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transcript_jobs', sa.Column('not_before', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('transcript_jobs', 'not_before')
@@ -0,0 +1,42 @@
+"""add task search indexes
+
+Revision ID: ae6b6ac48114
+Revises: 11d013d65413
+Create Date: 2026-10-18 12:20:51.730963
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'ae6b6ac48114'
+down_revision: Union[str, Sequence[str], None] = '11d013d65413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_tasks_search_vector', 'tasks', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_tasks_text_trgm', 'tasks', ['text'], unique=False,
+        postgresql_using='gin', postgresql_ops={'text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_text_trgm', table_name='tasks', postgresql_using='gin')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_using='gin')
+    op.drop_column('tasks', 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it
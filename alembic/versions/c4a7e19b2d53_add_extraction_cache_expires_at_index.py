@@ -0,0 +1,27 @@
+"""add extraction cache expires_at index
+
+Revision ID: c4a7e19b2d53
+Revises: 8e2c5d7a1f40
+Create Date: 2026-10-18 22:03:15.917420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e19b2d53'
+down_revision: Union[str, Sequence[str], None] = '8e2c5d7a1f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_extraction_cache_expires_at', 'extraction_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_extraction_cache_expires_at', table_name='extraction_cache')
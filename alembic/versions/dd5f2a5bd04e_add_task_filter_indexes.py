@@ -0,0 +1,46 @@
+"""add task filter indexes
+
+Revision ID: dd5f2a5bd04e
+Revises: ae6b6ac48114
+Create Date: 2026-10-18 13:05:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd5f2a5bd04e'
+down_revision: Union[str, Sequence[str], None] = 'ae6b6ac48114'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (columns, kwargs); mirrors Task.__table_args__
+INDEXES = {
+    'ix_tasks_tags': (['tags'], {'postgresql_using': 'gin'}),
+    'ix_tasks_created_at_id': (['created_at', 'id'], {}),
+    'ix_tasks_updated_at_id': (['updated_at', 'id'], {}),
+    'ix_tasks_status_created_at_id': (['status', 'created_at', 'id'], {}),
+    'ix_tasks_priority_created_at_id': (['priority', 'created_at', 'id'], {}),
+    'ix_tasks_status_priority_created_at_id': (['status', 'priority', 'created_at', 'id'], {}),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tasks table writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, (columns, kwargs) in INDEXES.items():
+            op.create_index(
+                name, 'tasks', columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True, **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(list(INDEXES)):
+            op.drop_index(name, table_name='tasks', postgresql_concurrently=True, if_exists=True)
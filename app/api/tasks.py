@@ -1,31 +1,157 @@
 # app/api/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.schemas.task import TaskRead, TaskUpdate
-from app.schemas.task_filter import TaskFilterInput
-from app.services.task_service import list_tasks, update_task, delete_task, filter_tasks
+from app.core.db import get_db, get_read_db
+from app.schemas.task import TaskRead, TaskUpdate, TaskPage
+from app.schemas.task_filter import TaskFilterInput, MAX_PAGE_SIZE
+from app.schemas.task_bulk import TaskSelection, TaskBulkUpdate, TaskBulkResult
+from app.services.task_service import (
+    list_tasks, update_task, delete_task, filter_tasks, get_collection_version,
+    bulk_update_tasks, bulk_delete_tasks,
+)
+from app.services.task_response_cache import compute_etag, etag_matches, serialize_page, response_cache
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+async def _conditional_page(
+    request: Request,
+    db: AsyncSession,
+    scope: str,
+    params: Dict[str, Any],
+    load_page: Callable[[], Awaitable[TaskPage]],
+) -> Response:
+    """
+    Serve a list/filter response revalidated against the tasks table version:
+    - If-None-Match equal to the current ETag -> 304 without querying tasks
+    - same ETag already rendered in this process -> cached bytes
+    - otherwise run the query and cache the serialized body
+    """
+    # Read the version before the rows, so the body is never older than the ETag claims
+    version = await get_collection_version(db)
+    etag = compute_etag(version, scope, params)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = response_cache.get(etag)
+    if cached is None:
+        try:
+            page = await load_page()
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        cached = serialize_page(page)
+        response_cache.set(etag, *cached)
+
+    body, next_cursor = cached
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/", response_model=list[TaskRead])
-async def get_tasks(db: AsyncSession = Depends(get_db)):
-    """Fetch all tasks."""
-    return await list_tasks(db)
+async def get_tasks(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Fetch tasks. With `limit`, returns one page and sets X-Next-Cursor when more remain.
+    Responses carry an ETag; send it back in If-None-Match to get 304 while nothing changed.
+    """
+    params = {"limit": limit, "cursor": cursor, "sort_by": sort_by, "order": order}
+    return await _conditional_page(
+        request, db, "list", params, lambda: list_tasks(db, **params)
+    )
+
+
+@router.get("/cache/stats")
+async def task_response_cache_stats():
+    """Hit/miss counters of the serialized list/filter response cache for this process."""
+    return response_cache.snapshot()
+
+
+def _bulk_result(affected: list[str], ids: Optional[list[str]]) -> TaskBulkResult:
+    found = set(affected)
+    not_found = [i for i in dict.fromkeys(ids) if i not in found] if ids is not None else []
+    return TaskBulkResult(affected=affected, count=len(affected), not_found=not_found)
+
+
+# Declared before /{task_id} so "bulk" is not taken for a task id
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def patch_tasks_bulk(body: TaskBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """Apply one patch to many tasks (by ids or by filter) in a single UPDATE statement."""
+    try:
+        affected = await bulk_update_tasks(db, body.patch, ids=body.ids, filters=body.filter)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _bulk_result(affected, body.ids)
+
+
+@router.delete("/bulk", response_model=TaskBulkResult)
+async def remove_tasks_bulk(body: TaskSelection, db: AsyncSession = Depends(get_db)):
+    """Delete many tasks (by ids or by filter) in a single DELETE statement."""
+    try:
+        affected = await bulk_delete_tasks(db, ids=body.ids, filters=body.filter)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _bulk_result(affected, body.ids)
+
+
+def _task_etag(task: TaskRead) -> str:
+    return f'"{task.version}"'
+
+
+def _if_match_versions(if_match: str) -> Optional[list[int]]:
+    """Versions listed in If-Match (None for `*`). Weak or malformed tags never match."""
+    if if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if tag.startswith('"') and tag.endswith('"') and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
 
 
 @router.patch("/{task_id}", response_model=TaskRead)
 async def patch_task(
-    task_id: str, patch: TaskUpdate, db: AsyncSession = Depends(get_db)
+    task_id: str,
+    patch: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
 ):
-    """Update a task by ID."""
-    updated = await update_task(db, task_id, patch)
+    """
+    Update a task by ID in a single statement.
+    With If-Match: "<version>" the update only applies if nobody changed the task since;
+    otherwise 412 (the client should re-read the task and retry).
+    """
+    expected = _if_match_versions(if_match) if if_match is not None else None
+    try:
+        updated = await update_task(db, task_id, patch, expected_versions=expected)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     if not updated:
+        # no extra read to tell "gone" from "changed": under If-Match both are a failed precondition
+        if if_match is not None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Task was modified or deleted; re-read it and retry",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
         )
+    response.headers["ETag"] = _task_etag(updated)
     return updated
 
 
@@ -42,15 +168,27 @@ async def remove_task(task_id: str, db: AsyncSession = Depends(get_db)):
 
 @router.post("/filter", response_model=list[TaskRead])
 async def get_filtered_tasks(
-    filters: TaskFilterInput, db: AsyncSession = Depends(get_db)
+    filters: TaskFilterInput, request: Request, db: AsyncSession = Depends(get_read_db)
 ):
-
-    return await filter_tasks(
+    """
+    Filter tasks. With `limit`, returns one page and sets X-Next-Cursor when more remain.
+    Supports ETag / If-None-Match like GET /api/tasks/.
+    """
+    return await _conditional_page(
+        request,
         db,
-        status=filters.status,
-        priority=filters.priority,
-        keyword=filters.keyword,
-        tags=filters.tags,
-        sort_by=filters.sort_by,
-        order=filters.order,
+        "filter",
+        filters.model_dump(mode="json"),
+        lambda: filter_tasks(
+            db,
+            status=filters.status,
+            priority=filters.priority,
+            keyword=filters.keyword,
+            search_mode=filters.search_mode,
+            tags=filters.tags,
+            sort_by=filters.sort_by,
+            order=filters.order,
+            limit=filters.limit,
+            cursor=filters.cursor,
+        ),
     )
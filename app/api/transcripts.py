@@ -1,14 +1,33 @@
 # app/api/transcripts.py
+import json
 import logging
-import asyncio
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
-from app.services import ai_service
+from app.core.db import get_db, AsyncSessionLocal
+from app.core.tracing import span
+from app.services.ai_service import LLMUnavailableError
 from app.services.task_service import create_tasks
+from app.services.transcript_service import (
+    BatchTooLargeError,
+    InvalidBatchItemError,
+    extract_transcript_tasks,
+    extraction_flights,
+    process_transcript_batch,
+    stream_transcript_tasks,
+)
+from app.services.extraction_cache import extraction_cache
+from app.services.job_service import enqueue_job, get_job
 from app.utils.text import sanitize_transcript
-from app.schemas.transcript import TranscriptInput, TranscriptResponse
+from app.schemas.transcript import (
+    TranscriptInput,
+    TranscriptResponse,
+    TranscriptJobRead,
+    TranscriptBatchInput,
+    TranscriptBatchResponse,
+)
 from app.schemas.task import TaskCreate, TaskRead
 
 router = APIRouter(prefix="/api/transcripts", tags=["transcripts"])
@@ -19,17 +38,22 @@ async def submit_transcript(
     payload: TranscriptInput, db: AsyncSession = Depends(get_db)
 ):
     """Accepts a raw transcript, extracts actionable tasks, saves them, and returns them."""
-    transcript = sanitize_transcript(payload.transcript)
+    with span("sanitize", chars=len(payload.transcript)):
+        transcript = sanitize_transcript(payload.transcript)
 
     if not transcript:
         raise HTTPException(status_code=400, detail="Transcript is empty.")
 
-    # --- Extract tasks from AI service ---
+    # --- Extract tasks (extraction cache, then AI service) ---
     try:
-        if asyncio.iscoroutinefunction(ai_service.extract_tasks):
-            tasks = await ai_service.extract_tasks(transcript)
-        else:
-            tasks = await asyncio.to_thread(ai_service.extract_tasks, transcript)
+        with span("extract"):
+            tasks = await extract_transcript_tasks(transcript)
+    except LLMUnavailableError as e:
+        # rate limited / circuit open: refused up front, so tell the client to come back later
+        logging.warning("Task extraction refused (%s): %s", e.reason, e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Task extraction is temporarily unavailable."
+        )
     except Exception:
         logging.exception("Error during extract_tasks")
         raise HTTPException(
@@ -41,7 +65,8 @@ async def submit_transcript(
 
     # --- Persist extracted tasks ---
     try:
-        created: list[TaskRead] = await create_tasks(db, tasks)
+        with span("persist", tasks=len(tasks)):
+            created: list[TaskRead] = await create_tasks(db, tasks)
     except Exception:
         logging.exception("Error during create_tasks")
         raise HTTPException(
@@ -49,3 +74,159 @@ async def submit_transcript(
         )
 
     return {"tasks": created}
+
+
+@router.get("/cache/stats")
+async def extraction_cache_stats():
+    """Hit/miss counters of the extraction cache (and request coalescing) for this process."""
+    return {
+        **extraction_cache.snapshot(),
+        "coalesced": extraction_flights.coalesced,
+        "in_flight": len(extraction_flights),
+    }
+
+
+def _job_read(job) -> TranscriptJobRead:
+    return TranscriptJobRead(
+        id=job.id,
+        status=job.status.value if hasattr(job.status, "value") else job.status,
+        attempts=job.attempts or 0,
+        error=job.error,
+        tasks=job.result,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/jobs", response_model=TranscriptJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def submit_transcript_job(
+    payload: TranscriptInput, response: Response, db: AsyncSession = Depends(get_db)
+):
+    """Queues a transcript for background extraction; poll the returned job for the tasks."""
+    transcript = sanitize_transcript(payload.transcript)
+
+    if not transcript:
+        raise HTTPException(status_code=400, detail="Transcript is empty.")
+
+    try:
+        job = await enqueue_job(db, transcript)
+    except Exception:
+        logging.exception("Error during enqueue_job")
+        raise HTTPException(
+            status_code=500, detail="Failed to queue transcript."
+        )
+
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+    return _job_read(job)
+
+
+@router.get("/jobs/{job_id}", response_model=TranscriptJobRead)
+async def get_transcript_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Status of a background transcript job, with its tasks once it has succeeded."""
+    job = await get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return _job_read(job)
+
+
+async def _ndjson_transcripts(request: Request):
+    """Yield transcripts from an NDJSON body as lines arrive; bad lines yield an InvalidBatchItemError instead."""
+    buffer = b""
+
+    def parse(line: bytes):
+        try:
+            item = json.loads(line)
+            return item if isinstance(item, str) else TranscriptInput.model_validate(item).transcript
+        except (ValueError, ValidationError):
+            return InvalidBatchItemError("Invalid NDJSON line: expected a string or {\"transcript\": ...}.")
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield parse(line)
+    if buffer.strip():
+        yield parse(buffer)
+
+
+@router.post(
+    "/batch",
+    response_model=TranscriptBatchResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": TranscriptBatchInput.model_json_schema()},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+            }
+        }
+    },
+)
+async def submit_transcript_batch(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Accepts many transcripts, as {"transcripts": [...]} JSON or an NDJSON stream (one transcript per line),
+    extracts them concurrently and saves all tasks together. Returns per-transcript tasks and errors.
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = _ndjson_transcripts(request)
+    else:
+        try:
+            batch = TranscriptBatchInput.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+        items = [t.transcript for t in batch.transcripts]
+
+    try:
+        results = await process_transcript_batch(db, items)
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    failed = sum(1 for r in results if r.error)
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
+
+
+def _stream_event(event: str, data: dict, sse: bool) -> str:
+    if sse:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, **data}) + "\n"
+
+
+@router.post("/stream")
+async def stream_transcript(payload: TranscriptInput, request: Request):
+    """
+    Like POST /api/transcripts/, but streams each task as soon as it is extracted and saved.
+    Server-Sent Events when the client accepts text/event-stream, NDJSON otherwise.
+    Events: "task" ({"task": TaskRead}), then "done" ({"count": n}) or "error" ({"detail": ...}).
+    """
+    transcript = sanitize_transcript(payload.transcript)
+
+    if not transcript:
+        raise HTTPException(status_code=400, detail="Transcript is empty.")
+
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def events():
+        count = 0
+        # the request-scoped session is already closed once streaming starts, so use our own
+        async with AsyncSessionLocal() as db:
+            try:
+                async for task in stream_transcript_tasks(transcript):
+                    created = await create_tasks(db, [task])
+                    for t in created:
+                        count += 1
+                        yield _stream_event("task", {"task": t.model_dump(mode="json")}, sse)
+            except Exception:
+                logging.exception("Error while streaming transcript tasks")
+                yield _stream_event("error", {"detail": "Failed to extract tasks from transcript."}, sse)
+                return
+        yield _stream_event("done", {"count": count}, sse)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
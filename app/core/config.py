@@ -0,0 +1,36 @@
+# app/core/config.py
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DatabaseSettings(BaseSettings):
+    """
+    Database settings, read from the environment (or .env).
+
+    - DATABASE_URL: primary (read/write) database, required
+    - DATABASE_READ_URL: optional read replica used by list/filter endpoints
+    - DB_*: pool and driver options, applied to both engines
+    """
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    database_url: str
+    database_read_url: Optional[str] = None
+
+    # log every statement (synchronously); for debugging only
+    db_echo: bool = False
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    # recycle connections older than this (seconds); -1 disables
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+
+    # asyncpg's per-connection prepared statement cache and SQLAlchemy's cache in front of it;
+    # set both to 0 behind PgBouncer in transaction pooling mode
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
+
+
+db_settings = DatabaseSettings()
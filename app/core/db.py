@@ -1,28 +1,66 @@
-import os
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
-# ✅ Load .env file
+# ✅ Load .env file (modules that read os.getenv rely on this too)
 load_dotenv()
 
-# ✅ Read DATABASE_URL from .env
-DATABASE_URL = os.getenv("DATABASE_URL")
+from app.core.config import db_settings  # noqa: E402  (after load_dotenv)
+from app.core.metrics import InstrumentedPool, pool_state  # noqa: E402
+from app.core.tracing import instrument_engine  # noqa: E402
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set. Check your .env file.")
 
-# ✅ Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+def _create_engine(url: str, name: str):
+    """Async engine with the pool/driver options from DatabaseSettings; `name` labels its pool metrics."""
+    settings = db_settings
+    options = dict(
+        echo=settings.db_echo,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    parsed = make_url(url)
+    if parsed.drivername.endswith("+asyncpg"):
+        options["connect_args"] = {"statement_cache_size": settings.db_statement_cache_size}
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.db_prepared_statement_cache_size)}
+        )
+    engine = create_async_engine(parsed, **options)
+    pool_state.register(name, engine)
+    instrument_engine(engine)
+    return engine
 
-# ✅ Session factory
+
+# ✅ Primary (read/write) engine
+engine = _create_engine(db_settings.database_url, "primary")
+
+# ✅ Read engine: the replica when DATABASE_READ_URL is set, otherwise the primary
+read_engine = _create_engine(db_settings.database_read_url, "read") if db_settings.database_read_url else engine
+
+# ✅ Session factories
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     expire_on_commit=False,
     class_=AsyncSession
 )
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession
+)
 
 # ✅ Dependency for FastAPI routes
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# ✅ Dependency for read-only routes; may lag the primary by the replica's replication delay
+async def get_read_db():
+    async with ReadSessionLocal() as session:
+        yield session
@@ -0,0 +1,196 @@
+# app/core/metrics.py
+import time
+import weakref
+from typing import Any, Dict
+
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.log import access_logger
+
+# --- HTTP ---------------------------------------------------------------------------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte, per route template.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently being handled.", ["method"]
+)
+
+# --- Database pool ------------------------------------------------------------------------------
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection (includes opening a new one).",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout.", ["pool"]
+)
+
+# --- OpenAI -------------------------------------------------------------------------------------
+
+OPENAI_REQUEST_DURATION = Histogram(
+    "openai_request_duration_seconds",
+    "Latency of one chat completion call (streamed calls: until the last chunk, excluding time the consumer "
+    "spent on yielded tasks).",
+    ["mode", "outcome"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+OPENAI_TOKENS = Counter("openai_tokens_total", "Tokens reported by the OpenAI API.", ["kind"])
+OPENAI_RETRIES = Counter("openai_retries_total", "Chat completion attempts that were retried.", ["reason"])
+OPENAI_RATE_LIMIT_WAIT = Histogram(
+    "openai_rate_limit_wait_seconds",
+    "Time a call waited for the client-side requests/tokens per minute limiter.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+OPENAI_REJECTED = Counter(
+    "openai_rejected_total",
+    "Calls refused client-side without reaching OpenAI (rate_limited, circuit_open).",
+    ["reason"],
+)
+OPENAI_CIRCUIT_STATE = Gauge("openai_circuit_state", "OpenAI circuit breaker: 0 closed, 1 half-open, 2 open.")
+LLM_OUTPUT_PARSES = Counter(
+    "llm_output_parses_total",
+    "Model outputs by how their JSON parsed: clean, salvaged (repaired / truncated, tasks recovered) "
+    "or failed (nothing recovered, call retried).",
+    ["outcome"],
+)
+LLM_OUTPUT_REPAIRS = Counter(
+    "llm_output_repairs_total", "Repairs applied to salvaged model output (see app.utils.json_salvage).", ["kind"]
+)
+
+# --- Extraction ---------------------------------------------------------------------------------
+
+EXTRACTIONS = Counter("extractions_total", "Transcript extractions, by the backend that served them.", ["backend"])
+EXTRACTION_FALLBACKS = Counter(
+    "extraction_fallbacks_total",
+    "Extractions the local tier served because the LLM tier failed (error) or refused the call "
+    "(rate_limited, circuit_open).",
+    ["reason"],
+)
+PREFILTER_TOKENS = Counter(
+    "prefilter_tokens_total",
+    "Estimated transcript tokens going into (input) and out of (output) the LLM pre-filter.",
+    ["stage"],
+)
+
+
+def record_openai_usage(usage: Any) -> None:
+    """Count prompt/completion tokens of a response (`usage` may be missing on some shapes)."""
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            OPENAI_TOKENS.labels(kind).inc(tokens)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that times every checkout. The pool is named by the engine's
+    `pool_logging_name` (e.g. "primary", "read").
+    """
+
+    def _do_get(self):
+        name = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(name).observe(time.perf_counter() - start)
+
+
+class _PoolStateCollector:
+    """Pool occupancy, read from each registered engine's current pool at scrape time."""
+
+    def __init__(self):
+        self._engines = weakref.WeakValueDictionary()
+
+    def register(self, name: str, engine) -> None:
+        # keep the (sync) engine, not the pool: engine.dispose() replaces the pool object
+        self._engines[name] = getattr(engine, "sync_engine", engine)
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size.", labels=["pool"])
+        connections = GaugeMetricFamily(
+            "db_pool_connections", "Pooled connections by state.", labels=["pool", "state"]
+        )
+        for name, engine in list(self._engines.items()):
+            pool = engine.pool
+            if not isinstance(pool, AsyncAdaptedQueuePool):
+                continue
+            size.add_metric([name], pool.size())
+            connections.add_metric([name, "checked_out"], pool.checkedout())
+            connections.add_metric([name, "idle"], pool.checkedin())
+            connections.add_metric([name, "overflow"], max(pool.overflow(), 0))
+        yield size
+        yield connections
+
+
+pool_state = _PoolStateCollector()
+REGISTRY.register(pool_state)
+
+
+def metrics_payload() -> tuple:
+    """(body, content type) of the Prometheus text exposition for this process."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# --- Middleware ---------------------------------------------------------------------------------
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware: per-route latency histogram, in-flight gauge and one structured
+    access log record per request (handed to the logging queue, never written on the loop).
+    Latency runs to the last body chunk, so streamed responses are measured in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        state: Dict[str, Any] = {"status": 500}
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            elapsed = time.perf_counter() - start
+            # route template (/api/tasks/{task_id}), not the raw path, keeps label cardinality bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, route_path, str(state["status"])).observe(elapsed)
+            access_logger.info(
+                "%s %s %s", method, scope["path"], state["status"],
+                extra={
+                    "method": method,
+                    "path": scope["path"],
+                    "route": route_path,
+                    "status": state["status"],
+                    "duration_ms": round(elapsed * 1000, 2),
+                    "client": (scope.get("client") or ("", None))[0],
+                },
+            )
@@ -0,0 +1,311 @@
+# app/core/tracing.py
+import os
+import sys
+import json
+import time
+import queue
+import logging
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+# where finished traces go, as OTLP/JSON lines: "none", "console" (stdout) or "file" (TRACE_FILE)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+SERVICE_NAME = os.getenv("SERVICE_NAME", "insightboard-api")
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+trace_logger = logging.getLogger("insightboard.trace")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: int, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class Trace:
+    """The spans of one request (or background job); the root span is `root`."""
+
+    def __init__(self, name: str, kind: int, attributes: Dict[str, Any]):
+        self.trace_id = secrets.token_hex(16)
+        self.root = Span(self.trace_id, None, name, kind, attributes)
+        self.spans: List[Span] = []
+
+    def stage_timings(self) -> Dict[str, Dict[str, float]]:
+        """Total duration and count of finished child spans, grouped by name (in first-seen order)."""
+        stages: Dict[str, Dict[str, float]] = {}
+        for s in self.spans:
+            stage = stages.setdefault(s.name, {"dur": 0.0, "count": 0})
+            stage["dur"] += s.duration_ms
+            stage["count"] += 1
+        return stages
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value: one metric per stage plus the elapsed total."""
+        parts = []
+        for name, stage in self.stage_timings().items():
+            part = f"{name};dur={stage['dur']:.1f}"
+            if stage["count"] > 1:
+                part += f';desc="{stage["count"]} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def _finish(trace: Trace, s: Span, error: Optional[BaseException]) -> None:
+    s.end_ns = time.time_ns()
+    if error is not None:
+        s.error = f"{type(error).__name__}: {error}"
+    if s is not trace.root:
+        trace.spans.append(s)
+
+
+@contextmanager
+def start_trace(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """
+    Root span of a request/job. Spans opened while it is active (in this task or tasks it spawns)
+    belong to it; when it ends the trace is logged as a per-stage summary and exported.
+    """
+    if not TRACING_ENABLED or _current_trace.get() is not None:
+        yield _current_trace.get()
+        return
+
+    trace = Trace(name, kind, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    error = None
+    try:
+        yield trace
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        _finish(trace, trace.root, error)
+        _report(trace)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """Child span of the current span; a no-op outside a trace. Not for use across `yield`s of a generator."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    s = Span(trace.trace_id, parent.span_id if parent else None, name, kind, attributes)
+    token = _current_span.set(s)
+    error = None
+    try:
+        yield s
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(trace, s, error)
+
+
+def add_span(
+    name: str,
+    start_ns: int,
+    end_ns: int,
+    kind: int = SPAN_KIND_INTERNAL,
+    error: Optional[str] = None,
+    **attributes,
+) -> None:
+    """Record an already-timed leaf span (DB statements, streamed calls) under the current span."""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get()
+    s = Span(trace.trace_id, parent.span_id if parent else None, name, kind, attributes)
+    s.start_ns, s.end_ns, s.error = start_ns, end_ns, error
+    trace.spans.append(s)
+
+
+# --- export -------------------------------------------------------------------------------------
+
+class _OTLPJsonExporter:
+    """
+    Writes each finished trace as one OTLP/JSON `ExportTraceServiceRequest` line (readable by the
+    OpenTelemetry Collector's otlpjsonfile receiver). Writing happens on a background thread.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._queue: "queue.SimpleQueue[Trace]" = queue.SimpleQueue()
+        threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+
+    def export(self, trace: Trace) -> None:
+        self._queue.put(trace)
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                line = json.dumps({
+                    "resourceSpans": [{
+                        "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                        "scopeSpans": [{
+                            "scope": {"name": "insightboard"},
+                            "spans": [s.to_otlp() for s in [trace.root, *trace.spans]],
+                        }],
+                    }]
+                })
+                self._stream.write(line + "\n")
+                self._stream.flush()
+            except Exception:
+                logging.exception("Failed to export trace %s", trace.trace_id)
+
+
+def _make_exporter() -> Optional[_OTLPJsonExporter]:
+    if not TRACING_ENABLED or TRACE_EXPORTER == "none":
+        return None
+    if TRACE_EXPORTER == "console":
+        return _OTLPJsonExporter(sys.stdout)
+    if TRACE_EXPORTER == "file":
+        return _OTLPJsonExporter(open(TRACE_FILE, "a", encoding="utf-8"))
+    logging.warning("Unknown TRACE_EXPORTER %r; traces will not be exported", TRACE_EXPORTER)
+    return None
+
+
+_exporter = _make_exporter()
+
+
+def _report(trace: Trace) -> None:
+    if trace.spans:
+        trace_logger.info(
+            "%s %.1fms", trace.root.name, trace.root.duration_ms,
+            extra={
+                "trace_id": trace.trace_id,
+                "duration_ms": round(trace.root.duration_ms, 2),
+                "stages": {k: round(v["dur"], 2) for k, v in trace.stage_timings().items()},
+            },
+        )
+    if _exporter is not None:
+        _exporter.export(trace)
+
+
+# --- instrumentation ----------------------------------------------------------------------------
+
+def instrument_engine(engine) -> None:
+    """One `db` span per statement executed on `engine` (async or sync) inside a trace."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is not None:
+            conn.info.setdefault("trace_start_ns", []).append(time.time_ns())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("trace_start_ns")
+        if starts:
+            add_span(
+                "db", starts.pop(), time.time_ns(), SPAN_KIND_CLIENT,
+                **{"db.system": "postgresql", "db.statement": statement[:500]},
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        starts = conn.info.get("trace_start_ns") if conn is not None else None
+        if starts:
+            add_span(
+                "db", starts.pop(), time.time_ns(), SPAN_KIND_CLIENT,
+                error=str(exception_context.original_exception),
+                **{"db.system": "postgresql", "db.statement": (exception_context.statement or "")[:500]},
+            )
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: one trace per HTTP request, with a `Server-Timing` header summarising
+    the stages recorded before the response started (so browser devtools show the breakdown).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with start_trace(method, SPAN_KIND_SERVER, **{"http.method": method, "http.target": scope["path"]}) as trace:
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    trace.root.attributes["http.status_code"] = message["status"]
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                trace.root.name = f"{method} {getattr(route, 'path', None) or scope['path']}"
@@ -0,0 +1,26 @@
+# app/models/extraction_cache.py
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.task import Base
+
+
+class ExtractionCacheEntry(Base):
+    """Persistent tier of the transcript -> extracted tasks cache (shared by all replicas)."""
+    __tablename__ = "extraction_cache"
+
+    # sha256 of model + prompt version + sanitized transcript
+    key = sa.Column(sa.String(64), primary_key=True)
+    model = sa.Column(sa.String, nullable=False)
+    prompt_version = sa.Column(sa.String, nullable=False)
+
+    # list of TaskCreate dumps
+    tasks = sa.Column(JSONB, nullable=False, server_default="[]")
+
+    created_at = sa.Column(sa.DateTime, server_default=sa.text("now()"))
+    expires_at = sa.Column(sa.DateTime, nullable=True)
+
+    __table_args__ = (
+        # the expiry sweep deletes by expires_at
+        sa.Index("ix_extraction_cache_expires_at", "expires_at"),
+    )
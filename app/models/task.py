@@ -2,8 +2,8 @@
 import uuid
 import enum
 import sqlalchemy as sa
-from sqlalchemy.orm import declarative_base
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import declarative_base, deferred
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 
 Base = declarative_base()
 
@@ -41,11 +41,42 @@ class Task(Base):
     # ✅ Postgres ARRAY type, supports .contains() and .overlap()
     tags = sa.Column(ARRAY(sa.String), server_default="{}")
 
-    created_at = sa.Column(sa.DateTime, server_default=sa.text("now()"))
+    created_at = sa.Column(sa.DateTime, nullable=False, server_default=sa.text("now()"))
     updated_at = sa.Column(
         sa.DateTime,
+        nullable=False,
         server_default=sa.text("now()"),
         onupdate=sa.text("now()"),
     )
 
     source_id = sa.Column(sa.String, unique=True, nullable=True)
+
+    # ✅ Row version for optimistic concurrency (If-Match on PATCH); every UPDATE increments it
+    version = sa.Column(sa.Integer, nullable=False, server_default="1")
+
+    # ✅ Generated full-text document for keyword search (deferred: never needed in responses)
+    search_vector = deferred(sa.Column(
+        TSVECTOR,
+        sa.Computed("to_tsvector('english', coalesce(text, ''))", persisted=True),
+    ))
+
+    __table_args__ = (
+        # tags @> ARRAY[...] (Task.tags.contains)
+        sa.Index("ix_tasks_tags", "tags", postgresql_using="gin"),
+        # default listing / keyset pagination: ORDER BY <col>, id
+        sa.Index("ix_tasks_created_at_id", "created_at", "id"),
+        sa.Index("ix_tasks_updated_at_id", "updated_at", "id"),
+        # filter_tasks: status and/or priority equality, newest first
+        sa.Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        sa.Index("ix_tasks_priority_created_at_id", "priority", "created_at", "id"),
+        sa.Index("ix_tasks_status_priority_created_at_id", "status", "priority", "created_at", "id"),
+        # full-text search: search_vector @@ websearch_to_tsquery(...)
+        sa.Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # substring search: text ILIKE '%kw%' (pg_trgm)
+        sa.Index(
+            "ix_tasks_text_trgm",
+            "text",
+            postgresql_using="gin",
+            postgresql_ops={"text": "gin_trgm_ops"},
+        ),
+    )
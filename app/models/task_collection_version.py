@@ -0,0 +1,17 @@
+# app/models/task_collection_version.py
+import sqlalchemy as sa
+
+from app.models.task import Base
+
+
+class TaskCollectionVersion(Base):
+    """
+    Single-row change counter of the `tasks` table.
+    Every write to tasks bumps it in the same transaction, so list responses can be
+    revalidated (ETag / If-None-Match) by reading this row instead of the tasks themselves.
+    """
+    __tablename__ = "task_collection_version"
+
+    id = sa.Column(sa.SmallInteger, primary_key=True, default=1)
+    version = sa.Column(sa.BigInteger, nullable=False, server_default="0")
+    updated_at = sa.Column(sa.DateTime, server_default=sa.text("now()"))
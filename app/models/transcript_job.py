@@ -0,0 +1,52 @@
+# app/models/transcript_job.py
+import uuid
+import enum
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.task import Base
+
+
+class JobStatusEnum(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class TranscriptJob(Base):
+    """A transcript submitted for background extraction; the table doubles as the work queue."""
+    __tablename__ = "transcript_jobs"
+
+    id = sa.Column(
+        sa.String, primary_key=True, default=lambda: str(uuid.uuid4())
+    )
+    status = sa.Column(
+        sa.Enum(JobStatusEnum, name="jobstatusenum"),
+        nullable=False,
+        server_default="queued",
+    )
+
+    # sanitized transcript text
+    transcript = sa.Column(sa.Text, nullable=False)
+
+    # list of TaskRead dumps once the job has succeeded
+    result = sa.Column(JSONB, nullable=True)
+    error = sa.Column(sa.String, nullable=True)
+    attempts = sa.Column(sa.Integer, nullable=False, server_default="0")
+
+    created_at = sa.Column(sa.DateTime, server_default=sa.text("now()"))
+    updated_at = sa.Column(
+        sa.DateTime,
+        server_default=sa.text("now()"),
+        onupdate=sa.text("now()"),
+    )
+    started_at = sa.Column(sa.DateTime, nullable=True)
+    finished_at = sa.Column(sa.DateTime, nullable=True)
+    # a job requeued because the LLM refused the call is not claimed again before this
+    not_before = sa.Column(sa.DateTime, nullable=True)
+
+    __table_args__ = (
+        # workers poll for the oldest queued job
+        sa.Index("ix_transcript_jobs_status_created_at", "status", "created_at"),
+    )
@@ -1,5 +1,5 @@
 # app/schemas/task.py
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
@@ -25,10 +25,22 @@ class TaskRead(TaskBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    # incremented on every update; send it back as If-Match to PATCH without overwriting others' edits
+    version: int = 1
 
     class Config:
         from_attributes = True
 
+# Built once: validates/serializes a whole list of rows in a single pydantic-core call
+TaskReadList = TypeAdapter(List[TaskRead])
+
+
+class TaskPage(BaseModel):
+    """One page of tasks; pass next_cursor back to get the following page."""
+    tasks: List[TaskRead]
+    next_cursor: Optional[str] = None
+
+
 class TaskFilterInput(BaseModel):
     status: Optional[str] = None
     priority: Optional[str] = None
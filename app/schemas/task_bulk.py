@@ -0,0 +1,32 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.task import TaskUpdate
+from app.schemas.task_filter import TaskFilterInput
+
+# Upper bound on explicit ids per bulk request (keeps the IN list and the response reasonable)
+BULK_MAX_IDS = 5000
+
+
+class TaskSelection(BaseModel):
+    """Target of a bulk operation: explicit ids, or every task matching a filter (exactly one)."""
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=BULK_MAX_IDS)
+    # sort_by/order/limit/cursor are ignored; a bulk operation applies to every match
+    filter: Optional[TaskFilterInput] = None
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        return self
+
+
+class TaskBulkUpdate(TaskSelection):
+    patch: TaskUpdate
+
+
+class TaskBulkResult(BaseModel):
+    affected: List[str]
+    count: int
+    # requested ids that matched no task (only when selecting by ids)
+    not_found: List[str] = []
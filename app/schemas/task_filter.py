@@ -1,11 +1,18 @@
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Literal, Optional, List
+from pydantic import BaseModel, Field
 from app.models.task import StatusEnum, PriorityEnum
 
+MAX_PAGE_SIZE = 1000
+
 class TaskFilterInput(BaseModel):
     status: Optional[StatusEnum] = None
     priority: Optional[PriorityEnum] = None
     keyword: Optional[str] = None
+    # "fulltext" also allows sort_by="relevance"
+    search_mode: Literal["substring", "fulltext"] = "substring"
     tags: Optional[List[str]] = None
     sort_by: str = "created_at"
     order: str = "desc"
+    # Keyset pagination: omit limit to get every match
+    limit: Optional[int] = Field(None, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
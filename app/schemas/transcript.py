@@ -1,5 +1,6 @@
 # app/schemas/transcript.py
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.schemas.task import TaskRead
 
@@ -15,3 +16,37 @@ class TranscriptResponse(BaseModel):
         ...,
         description="Tasks extracted and saved from the transcript."
     )
+
+
+class TranscriptJobRead(BaseModel):
+    """State of a background transcript extraction job."""
+    id: str
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+    tasks: Optional[List[TaskRead]] = Field(
+        None,
+        description="Tasks extracted and saved by the job, once it has succeeded."
+    )
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class TranscriptBatchInput(BaseModel):
+    """Many transcripts submitted in one request."""
+    transcripts: List[TranscriptInput] = Field(..., description="Transcripts to process.")
+
+
+class TranscriptBatchItemResult(BaseModel):
+    """Outcome of one transcript in a batch, in submission order."""
+    index: int
+    tasks: List[TaskRead] = []
+    error: Optional[str] = None
+
+
+class TranscriptBatchResponse(BaseModel):
+    """Per-item results of a batch submission."""
+    results: List[TranscriptBatchItemResult]
+    succeeded: int
+    failed: int
@@ -1,161 +1,857 @@
 # app/services/ai_service.py
 import os
+import re
 import json
+import time
 import uuid
 import logging
 import asyncio
-from typing import List
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
 
-from openai import AsyncOpenAI, APITimeoutError, APIError
+from openai import (
+    AsyncOpenAI,
+    APIConnectionError,
+    APIError,
+    APIStatusError,
+    APITimeoutError,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+)
+from app.core.metrics import (
+    EXTRACTION_FALLBACKS,
+    LLM_OUTPUT_PARSES,
+    LLM_OUTPUT_REPAIRS,
+    OPENAI_CIRCUIT_STATE,
+    OPENAI_RATE_LIMIT_WAIT,
+    OPENAI_REJECTED,
+    OPENAI_REQUEST_DURATION,
+    PREFILTER_TOKENS,
+    OPENAI_RETRIES,
+    record_openai_usage,
+)
+from app.core.tracing import SPAN_KIND_CLIENT, add_span, span
 from app.schemas.task import TaskCreate
+from app.utils import exact_details
+from app.utils.json_salvage import salvage_json
+from app.utils.json_stream import JSONArrayStream
+from app.utils.openai_cassette import CassetteTransport
+from app.utils.prefilter import PrefilterConfig, prefilter_transcript
+from app.utils.ratelimit import CircuitBreaker, CircuitOpenError, RateLimiter, RateLimitTimeout, retry_delay
+from app.utils.text import chunk_transcript
+
+# OpenAI-compatible endpoint; point it at benchmarks/fake_openai.py (e.g. http://127.0.0.1:8100/v1)
+# for load tests. Unset means the public API.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# Record/replay of OpenAI calls (see app.utils.openai_cassette): "off", "record", "replay" or "auto".
+# Replay runs extraction fully offline; OPENAI_CASSETTE_LATENCY_MS is a fixed delay or "recorded".
+OPENAI_CASSETTE_MODE = os.getenv("OPENAI_CASSETTE_MODE", "off").lower()
+OPENAI_CASSETTE_DIR = os.getenv("OPENAI_CASSETTE_DIR", "cassettes/openai")
+OPENAI_CASSETTE_LATENCY_MS = os.getenv("OPENAI_CASSETTE_LATENCY_MS") or None
+
+
+def _http_client() -> Optional[DefaultAsyncHttpxClient]:
+    if OPENAI_CASSETTE_MODE == "off":
+        return None
+    logging.info("OpenAI cassette in %s mode (%s)", OPENAI_CASSETTE_MODE, OPENAI_CASSETTE_DIR)
+    transport = CassetteTransport(OPENAI_CASSETTE_MODE, OPENAI_CASSETTE_DIR, OPENAI_CASSETTE_LATENCY_MS)
+    return DefaultAsyncHttpxClient(transport=transport)
+
+
+# The SDK's own retries (2 by default, with their own backoff) are invisible to the rate limiter
+# and the circuit breaker below, so _extract_single / _stream_single are the only retry layer.
+OPENAI_SDK_MAX_RETRIES = int(os.getenv("OPENAI_SDK_MAX_RETRIES", "0"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
 
 # make client a module-level singleton
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    base_url=OPENAI_BASE_URL,
+    http_client=_http_client(),
+    max_retries=OPENAI_SDK_MAX_RETRIES,
+    timeout=OPENAI_TIMEOUT_SECONDS,
+)
+
+# Client-side pacing of `client` (app.utils.ratelimit), shared by every request of this process:
+# with several workers, split the account's limits between them. 0 = no limit. A call that would
+# wait longer than OPENAI_RATE_LIMIT_MAX_WAIT seconds is refused instead.
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0"))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "0"))
+OPENAI_RATE_LIMIT_MAX_WAIT = float(os.getenv("OPENAI_RATE_LIMIT_MAX_WAIT", "30"))
+limiter = RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE, OPENAI_RATE_LIMIT_MAX_WAIT)
+
+# Circuit breaker: once OPENAI_CIRCUIT_FAILURE_RATIO of the calls in the last
+# OPENAI_CIRCUIT_WINDOW_SECONDS (at least OPENAI_CIRCUIT_MIN_CALLS of them) failed upstream
+# (timeouts, connection errors, 429s, 5xx), calls are refused for OPENAI_CIRCUIT_RESET_SECONDS.
+breaker = CircuitBreaker(
+    failure_ratio=float(os.getenv("OPENAI_CIRCUIT_FAILURE_RATIO", "0.5")),
+    min_calls=int(os.getenv("OPENAI_CIRCUIT_MIN_CALLS", "10")),
+    window=float(os.getenv("OPENAI_CIRCUIT_WINDOW_SECONDS", "60")),
+    reset_timeout=float(os.getenv("OPENAI_CIRCUIT_RESET_SECONDS", "30")),
+)
+# upper bound of the jittered backoff between attempts (a longer Retry-After still wins)
+RETRY_MAX_DELAY = 30.0
+
+MODEL = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 800
+# Bump whenever SYSTEM_PROMPT / EXAMPLE_OUTPUT / parsing change so cached extractions are invalidated
+PROMPT_VERSION = "1"
+
+# Pre-filter of the LLM input (app.utils.prefilter): drops attendee lists, small talk and repeated
+# lines, then the least actionable lines until the transcript fits PREFILTER_TOKEN_BUDGET (0 = no cap)
+PREFILTER = PrefilterConfig(
+    enabled=os.getenv("PREFILTER_ENABLED", "false").lower() in ("1", "true", "yes"),
+    token_budget=int(os.getenv("PREFILTER_TOKEN_BUDGET", "0")),
+    near_duplicate_threshold=float(os.getenv("PREFILTER_NEAR_DUPLICATE", "0.9")),
+    mark_gaps=os.getenv("PREFILTER_MARK_GAPS", "true").lower() in ("1", "true", "yes"),
+)
+# Version of cached extractions: the prompt plus what the pre-filter does to its input
+EXTRACTION_VERSION = PROMPT_VERSION + PREFILTER.cache_tag()
+
+# Chunked (map-reduce) extraction for long transcripts
+CHUNK_MAX_CHARS = int(os.getenv("EXTRACT_CHUNK_MAX_CHARS", "6000"))
+CHUNK_OVERLAP_CHARS = int(os.getenv("EXTRACT_CHUNK_OVERLAP_CHARS", "400"))
+CHUNK_CONCURRENCY = int(os.getenv("EXTRACT_CHUNK_CONCURRENCY", "4"))
+
+# Strict instruction: model must output only a JSON array (no extra commentary)
+SYSTEM_PROMPT = (
+    "You are a JSON-only extractor. Given a transcript, return EXACTLY a JSON array (and nothing else) "
+    "where each element is an object with keys: id (string), text (string), priority (one of: low, medium, high), tags (array of strings). "
+    "If a field is unknown, set it to null, empty string, or an empty array. Do NOT output explanations or markdown."
+)
+
+# Provide a short example to reduce ambiguity
+EXAMPLE_OUTPUT = (
+    "Example output:\n"
+    '[\n'
+    '  { "id": "1", "text": "Fix payment gateway race condition", "priority": "high", "tags": ["payments","backend"] },\n'
+    '  { "id": "2", "text": "Run full regression tests over weekend", "priority": "high", "tags": ["qa","regression"] }\n'
+    "]"
+)
+
+_PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2}
+
+
+def build_messages(transcript: str) -> List[Dict[str, str]]:
+    user = f"{EXAMPLE_OUTPUT}\n\nTranscript:\n'''{transcript}'''"
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user},
+    ]
+
+
+def response_content(resp: Any) -> Any:
+    """Pull the message content out of a chat completion, tolerating different SDK response shapes."""
+    content = None
+
+    # Different SDKs/response shapes exist; handle defensively
+    if hasattr(resp, "choices") and len(resp.choices) > 0:
+        choice = resp.choices[0]
+        # Newer SDK shapes may have `.message.content`, older may have `.text` or `.message["content"]`
+        if getattr(choice, "message", None) is not None:
+            content = getattr(choice.message, "content", None)
+            if content is None and isinstance(choice.message, dict):
+                content = choice.message.get("content")
+        elif hasattr(choice, "text"):
+            content = choice.text
+        elif hasattr(choice, "content"):
+            content = choice.content
+        else:
+            # fallback to string representation
+            content = str(choice)
+    else:
+        # fallback if SDK puts text elsewhere
+        content = getattr(resp, "content", None) or str(resp)
+
+    if content is None:
+        raise RuntimeError("OpenAI response contains no content.")
+    return content
 
-async def extract_tasks(transcript: str, *, max_retries: int = 3, retry_base_delay: float = 1.0) -> List[TaskCreate]:
+
+def normalize_task(raw: Dict[str, Any]) -> TaskCreate:
+    """Map one model-produced task object onto TaskCreate (flexible keys, defaulted priority/tags)."""
+    text_val = raw.get("text") or raw.get("title") or raw.get("task") or ""
+    id_val = raw.get("id") or raw.get("task_id") or str(uuid.uuid4())
+    pr = (raw.get("priority") or "").lower() if raw.get("priority") else ""
+    if pr not in ("low", "medium", "high"):
+        pr = "medium"  # default fallback
+    tags_val = raw.get("tags") or raw.get("labels") or []
+    if not isinstance(tags_val, list):
+        # if model returns comma-joined tags string, split it
+        if isinstance(tags_val, str):
+            tags_val = [t.strip() for t in tags_val.split(",") if t.strip()]
+        else:
+            tags_val = []
+
+    # Build pydantic model (this will validate types too)
+    return TaskCreate(id=id_val, text=text_val, priority=pr, tags=tags_val)
+
+
+def _record_parse(outcome: str, repairs: List[str] = ()) -> None:
+    LLM_OUTPUT_PARSES.labels(outcome).inc()
+    for kind in repairs:
+        LLM_OUTPUT_REPAIRS.labels(kind).inc()
+    if repairs:
+        logging.info("Salvaged malformed model output (%s)", ", ".join(repairs))
+
+
+def _salvage_element(element: str) -> Any:
+    return salvage_json(element).value
+
+
+def parse_tasks(content: Any) -> List[TaskCreate]:
+    """
+    Turn raw model output into TaskCreate models. Malformed or truncated JSON is salvaged
+    (app.utils.json_salvage): every complete task that can be recovered is kept.
+    Raises json.JSONDecodeError only when nothing can be recovered.
+    """
+    # If it's already a dict/list, keep it. If it's a string, parse (or salvage) JSON out of it.
+    parsed = None
+    if isinstance(content, (dict, list)):
+        parsed = content
+    else:
+        try:
+            salvage = salvage_json(str(content))
+        except json.JSONDecodeError:
+            _record_parse("failed")
+            raise
+        _record_parse("salvaged" if salvage.repairs else "clean", salvage.repairs)
+        parsed = salvage.value
+
+    # Normalize parsed into tasks list:
+    if isinstance(parsed, list):
+        tasks_raw = parsed
+    elif isinstance(parsed, dict) and "tasks" in parsed and isinstance(parsed["tasks"], list):
+        tasks_raw = parsed["tasks"]
+    else:
+        # If the model returned a dict of items, try to coerce its values to a list
+        if isinstance(parsed, dict):
+            # sometimes model returns {"1": {...}, "2": {...}}
+            possible = []
+            for v in parsed.values():
+                if isinstance(v, dict):
+                    possible.append(v)
+            tasks_raw = possible
+        else:
+            tasks_raw = []
+
+    result: List[TaskCreate] = []
+    for raw in tasks_raw:
+        if not isinstance(raw, dict):
+            logging.warning("Skipping non-dict task element: %r", raw)
+            continue
+        try:
+            result.append(normalize_task(raw))
+        except Exception as e:
+            logging.exception("Failed to construct TaskCreate for raw=%r: %s", raw, e)
+            # skip invalid entries
+
+    return result
+
+
+def _dedupe_key(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def _is_near_duplicate(a: str, b: str, threshold: float = 0.8) -> bool:
+    wa, wb = set(a.split()), set(b.split())
+    if not wa or not wb:
+        return a == b
+    return len(wa & wb) / len(wa | wb) >= threshold
+
+
+def merge_tasks(task_lists: List[List[TaskCreate]]) -> List[TaskCreate]:
+    """
+    Reduce step for chunked extraction: concatenate per-chunk results in order and drop duplicates.
+    Chunks overlap, so the same task is often extracted twice with slightly different wording;
+    duplicates keep the first wording, the highest priority and the union of tags.
+    """
+    merged: List[TaskCreate] = []
+    keys: List[str] = []
+    for tasks in task_lists:
+        for task in tasks:
+            key = _dedupe_key(task.text)
+            match = next(
+                (i for i, k in enumerate(keys) if k == key or _is_near_duplicate(k, key)),
+                None,
+            )
+            if match is None:
+                merged.append(task)
+                keys.append(key)
+                continue
+
+            kept = merged[match]
+            if _PRIORITY_RANK.get(task.priority, 1) > _PRIORITY_RANK.get(kept.priority, 1):
+                kept.priority = task.priority
+            kept.tags = kept.tags + [t for t in task.tags if t not in kept.tags]
+    return merged
+
+
+class LLMUnavailableError(RuntimeError):
+    """
+    The LLM tier refused a call without making it: over the client-side rate limit
+    ("rate_limited") or the circuit breaker is open ("circuit_open"). `retry_after` is the number
+    of seconds until a call is expected to be admitted again.
+    """
+
+    def __init__(self, message: str, reason: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _is_upstream_failure(e: BaseException) -> bool:
+    """Errors that say OpenAI is struggling (and count towards opening the circuit)."""
+    if isinstance(e, (APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(e, APIStatusError) and (e.status_code == 429 or e.status_code >= 500)
+
+
+@asynccontextmanager
+async def _guarded_call(tokens: int):
+    """
+    Admit one OpenAI call through the circuit breaker and the rate limiter (reserving one request
+    and `tokens` tokens), then report its outcome to the breaker. Raises LLMUnavailableError,
+    without calling, when either of them refuses.
+    """
+    try:
+        breaker.before_call()
+    except CircuitOpenError as e:
+        OPENAI_REJECTED.labels("circuit_open").inc()
+        raise LLMUnavailableError(str(e), "circuit_open", breaker.retry_in()) from e
+    try:
+        try:
+            waited = await limiter.acquire(tokens)
+        except RateLimitTimeout as e:
+            OPENAI_REJECTED.labels("rate_limited").inc()
+            raise LLMUnavailableError(str(e), "rate_limited", e.wait) from e
+        if limiter.enabled:
+            OPENAI_RATE_LIMIT_WAIT.observe(waited)
+        yield
+    except LLMUnavailableError:
+        breaker.release()
+        raise
+    except Exception as e:
+        if _is_upstream_failure(e):
+            breaker.record_failure()
+        else:
+            # OpenAI answered (e.g. with something unparseable): it is up
+            breaker.record_success()
+        raise
+    except BaseException:
+        # cancelled / client went away: no verdict on OpenAI's health
+        breaker.release()
+        raise
+    else:
+        breaker.record_success()
+    finally:
+        OPENAI_CIRCUIT_STATE.set({breaker.CLOSED: 0, breaker.HALF_OPEN: 1, breaker.OPEN: 2}[breaker.state])
+
+
+def _record_usage(usage: Any, reserved: int) -> None:
+    """Count the tokens of a response and settle the limiter's reservation against them."""
+    record_openai_usage(usage)
+    used = getattr(usage, "total_tokens", None)
+    if used:
+        limiter.settle(reserved, used)
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """Delay the server asked for (retry-after-ms / retry-after headers), if any."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(float(value) / scale, 0.0)
+            except ValueError:
+                # HTTP-date form; fall back to our own backoff
+                continue
+    return None
+
+
+def _backoff_delay(e: Exception, attempt: int, retry_base_delay: float) -> float:
+    """Jittered exponential backoff, never shorter than the server's Retry-After."""
+    retry_after = _retry_after(e)
+    if retry_after is not None and isinstance(e, RateLimitError):
+        # the account is over its quota: hold back every caller, not just this one
+        limiter.pause(retry_after)
+    return retry_delay(attempt, retry_base_delay, RETRY_MAX_DELAY, retry_after)
+
+
+def _raise_if_final(e: Exception, attempt: int, max_retries: int) -> None:
+    """
+    Log a failed attempt; raise RuntimeError if it is the last one or the error is not transient,
+    otherwise count the upcoming retry. Calls refused client-side (LLMUnavailableError) are
+    re-raised as they are: retrying would only be refused again.
+    """
+    if isinstance(e, LLMUnavailableError):
+        logging.warning("OpenAI call refused (%s): %s", e.reason, e)
+        raise e
+    if isinstance(e, (APITimeoutError, asyncio.TimeoutError)):
+        logging.warning("OpenAI timeout (attempt %d/%d): %s", attempt, max_retries, e)
+        if attempt == max_retries:
+            raise RuntimeError("OpenAI request timed out")
+        reason = "timeout"
+    elif isinstance(e, APIError):
+        logging.warning("OpenAI API error (attempt %d/%d): %s", attempt, max_retries, e)
+        if attempt == max_retries:
+            raise RuntimeError(f"OpenAI API error: {str(e)}")
+        reason = "rate_limited" if isinstance(e, RateLimitError) else "api_error"
+    elif isinstance(e, json.JSONDecodeError):
+        logging.exception("JSON decode error when parsing OpenAI response (attempt %d/%d): %s", attempt, max_retries, e)
+        if attempt == max_retries:
+            raise RuntimeError(f"Failed to parse OpenAI response as JSON: {str(e)}")
+        reason = "invalid_json"
+    else:
+        logging.exception("Unexpected error in extract_tasks (attempt %d/%d): %s", attempt, max_retries, e)
+        # fail fast for unexpected exceptions
+        raise RuntimeError(f"Unexpected error extracting tasks: {e}")
+    OPENAI_RETRIES.labels(reason).inc()
+
+
+class _CallClock:
+    """Consumer time inside a streamed call, which is not OpenAI's latency."""
+
+    def __init__(self):
+        self.paused = 0.0
+
+    @contextmanager
+    def pause(self):
+        """Wrap each `yield` to the consumer (e.g. a per-task DB commit) so it is left out."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused += time.perf_counter() - start
+
+
+@contextmanager
+def _timed_call(mode: str, attempt: int):
+    """
+    Observe one OpenAI call in openai_request_duration_seconds (labelled by outcome) and record it
+    as an `openai` span of the current trace. Yields a _CallClock: time spent in its `pause()`
+    blocks is excluded from the duration and reported as the span's `openai.consumer_ms`.
+    """
+    start = time.perf_counter()
+    start_ns = time.time_ns()
+    clock = _CallClock()
+    outcome = "error"
+    error = None
+    try:
+        yield clock
+        outcome = "ok"
+    except (APITimeoutError, asyncio.TimeoutError) as e:
+        outcome, error = "timeout", str(e) or "timeout"
+        raise
+    except (GeneratorExit, asyncio.CancelledError):
+        # client went away mid-stream
+        outcome = "cancelled"
+        raise
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        OPENAI_REQUEST_DURATION.labels(mode, outcome).observe(time.perf_counter() - start - clock.paused)
+        add_span(
+            "openai", start_ns, time.time_ns(), SPAN_KIND_CLIENT, error=error,
+            **{
+                "openai.model": MODEL, "openai.mode": mode, "openai.attempt": attempt, "openai.outcome": outcome,
+                "openai.consumer_ms": round(clock.paused * 1000, 1),
+            },
+        )
+
+
+async def _extract_single(transcript: str, *, max_retries: int, retry_base_delay: float) -> List[TaskCreate]:
+    """One chat completion call (with retries) over the whole of `transcript`."""
+    messages = build_messages(transcript)
+    reserved = estimate_tokens(transcript) + MAX_COMPLETION_TOKENS
+
+    for attempt in range(1, max_retries + 1):
+        try:
+            async with _guarded_call(reserved):
+                with _timed_call("complete", attempt):
+                    resp = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=messages,
+                        temperature=0.0,
+                        max_tokens=MAX_COMPLETION_TOKENS,
+                    )
+            _record_usage(getattr(resp, "usage", None), reserved)
+            return parse_tasks(response_content(resp))
+        except Exception as e:
+            _raise_if_final(e, attempt, max_retries)
+            delay = _backoff_delay(e, attempt, retry_base_delay)
+
+        # jittered exponential backoff before retrying
+        with span("backoff", attempt=attempt):
+            await asyncio.sleep(delay)
+
+    # should not reach here
+    return []
+
+
+async def _stream_single(transcript: str, *, max_retries: int, retry_base_delay: float) -> AsyncIterator[TaskCreate]:
+    """
+    Streaming counterpart of _extract_single: yields each task as soon as its JSON object is complete.
+    An attempt is only retried while nothing has been yielded yet.
+    """
+    messages = build_messages(transcript)
+    reserved = estimate_tokens(transcript) + MAX_COMPLETION_TOKENS
+
+    for attempt in range(1, max_retries + 1):
+        emitted = 0
+        try:
+            async with _guarded_call(reserved):
+                with _timed_call("stream", attempt) as clock:
+                    stream = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=messages,
+                        temperature=0.0,
+                        max_tokens=MAX_COMPLETION_TOKENS,
+                        stream=True,
+                        # final chunk carries token usage (and no choices)
+                        stream_options={"include_usage": True},
+                    )
+                    parser = JSONArrayStream(repair=_salvage_element)
+                    async for chunk in stream:
+                        _record_usage(getattr(chunk, "usage", None), reserved)
+                        if not chunk.choices:
+                            continue
+                        delta = getattr(chunk.choices[0].delta, "content", None)
+                        if not delta:
+                            continue
+                        for raw in parser.feed(delta):
+                            if not isinstance(raw, dict):
+                                logging.warning("Skipping non-dict task element: %r", raw)
+                                continue
+                            try:
+                                task = normalize_task(raw)
+                            except Exception as e:
+                                logging.exception("Failed to construct TaskCreate for raw=%r: %s", raw, e)
+                                continue
+                            emitted += 1
+                            with clock.pause():
+                                yield task
+
+            if not parser.started or (not parser.done and not emitted):
+                _record_parse("failed")
+                raise json.JSONDecodeError("No complete JSON array element in streamed response", "", 0)
+            # cut off (e.g. by max_tokens) after some complete tasks: keep them rather than call again
+            repairs = (["truncated"] if not parser.done else []) + ["element"] * parser.repaired
+            _record_parse("salvaged" if repairs else "clean", repairs)
+            return
+        except Exception as e:
+            if emitted:
+                logging.exception("OpenAI stream failed after %d tasks", emitted)
+                raise RuntimeError(f"OpenAI stream interrupted: {e}")
+            _raise_if_final(e, attempt, max_retries)
+            delay = _backoff_delay(e, attempt, retry_base_delay)
+
+        # jittered exponential backoff before retrying
+        with span("backoff", attempt=attempt):
+            await asyncio.sleep(delay)
+
+
+async def extract_tasks(
+    transcript: str,
+    *,
+    max_retries: int = 3,
+    retry_base_delay: float = 1.0,
+    chunked: Optional[bool] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[TaskCreate]:
     """
     Extract actionable tasks from `transcript` using the OpenAI Async client.
     Returns a list of TaskCreate Pydantic models.
 
+    Long transcripts (over CHUNK_MAX_CHARS, or whenever `chunked=True`) are split on
+    paragraph/speaker boundaries, extracted chunk-by-chunk concurrently (at most
+    `max_concurrency` calls in flight) and merged, so latency tracks the slowest chunk
+    rather than the transcript length.
+
     Defensive: retries transient errors, tolerates different response shapes, normalizes keys.
     """
+    if chunked is None:
+        chunked = len(transcript) > CHUNK_MAX_CHARS
+    chunks = chunk_transcript(transcript, CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS) if chunked else [transcript]
 
-    # Strict instruction: model must output only a JSON array (no extra commentary)
-    system = (
-        "You are a JSON-only extractor. Given a transcript, return EXACTLY a JSON array (and nothing else) "
-        "where each element is an object with keys: id (string), text (string), priority (one of: low, medium, high), tags (array of strings). "
-        "If a field is unknown, set it to null, empty string, or an empty array. Do NOT output explanations or markdown."
-    )
+    if len(chunks) <= 1:
+        return await _extract_single(transcript, max_retries=max_retries, retry_base_delay=retry_base_delay)
 
-    # Provide a short example to reduce ambiguity
-    example = (
-        "Example output:\n"
-        '[\n'
-        '  { "id": "1", "text": "Fix payment gateway race condition", "priority": "high", "tags": ["payments","backend"] },\n'
-        '  { "id": "2", "text": "Run full regression tests over weekend", "priority": "high", "tags": ["qa","regression"] }\n'
-        "]"
-    )
+    semaphore = asyncio.Semaphore(max_concurrency or CHUNK_CONCURRENCY)
 
-    user = f"{example}\n\nTranscript:\n'''{transcript}'''"
+    async def run_chunk(chunk: str) -> List[TaskCreate]:
+        async with semaphore:
+            return await _extract_single(chunk, max_retries=max_retries, retry_base_delay=retry_base_delay)
 
-    for attempt in range(1, max_retries + 1):
+    logging.info("Extracting tasks from %d chunks (%d chars)", len(chunks), len(transcript))
+    try:
+        # a missing chunk would silently drop tasks, so the first failure fails the whole
+        # extraction; TaskGroup cancels the remaining chunks instead of paying for their calls
+        async with asyncio.TaskGroup() as tg:
+            pending = [tg.create_task(run_chunk(c)) for c in chunks]
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0]
+
+    return merge_tasks([t.result() for t in pending])
+
+
+async def stream_tasks(
+    transcript: str,
+    *,
+    max_retries: int = 3,
+    retry_base_delay: float = 1.0,
+    chunked: Optional[bool] = None,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[TaskCreate]:
+    """
+    Streaming variant of extract_tasks: yields TaskCreate models as the model produces them
+    (`stream=True`), instead of waiting for the whole JSON array.
+
+    Long transcripts are chunked exactly like extract_tasks; chunks stream concurrently and tasks are
+    yielded in arrival order, skipping duplicates of tasks already yielded.
+    """
+    if chunked is None:
+        chunked = len(transcript) > CHUNK_MAX_CHARS
+    chunks = chunk_transcript(transcript, CHUNK_MAX_CHARS, CHUNK_OVERLAP_CHARS) if chunked else [transcript]
+
+    if len(chunks) <= 1:
+        async for task in _stream_single(transcript, max_retries=max_retries, retry_base_delay=retry_base_delay):
+            yield task
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency or CHUNK_CONCURRENCY)
+    queue: "asyncio.Queue[Optional[TaskCreate]]" = asyncio.Queue()
+
+    async def pump(chunk: str) -> None:
+        async with semaphore:
+            async for task in _stream_single(chunk, max_retries=max_retries, retry_base_delay=retry_base_delay):
+                await queue.put(task)
+
+    async def pump_all() -> None:
         try:
-            resp = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": user},
-                ],
-                temperature=0.0,
-                max_tokens=800,
+            # TaskGroup cancels the remaining chunks as soon as one fails
+            async with asyncio.TaskGroup() as tg:
+                for chunk in chunks:
+                    tg.create_task(pump(chunk))
+        finally:
+            await queue.put(None)
+
+    logging.info("Streaming tasks from %d chunks (%d chars)", len(chunks), len(transcript))
+    runner = asyncio.create_task(pump_all())
+    seen: List[str] = []
+    try:
+        while (task := await queue.get()) is not None:
+            key = _dedupe_key(task.text)
+            if any(k == key or _is_near_duplicate(k, key) for k in seen):
+                continue
+            seen.append(key)
+            yield task
+        try:
+            await runner
+        except BaseExceptionGroup as eg:
+            raise eg.exceptions[0]
+    finally:
+        runner.cancel()
+
+
+# --- Extractor backends -------------------------------------------------------------------------
+
+# "llm" (every transcript goes to the model), "heuristic" (regex only, no model calls) or
+# "tiered" (short / highly structured transcripts stay local, the rest go to the model, and the
+# local tier takes over when the model is down or the rate limiter refuses the call)
+EXTRACTOR_BACKEND = os.getenv("EXTRACTOR_BACKEND", "llm").lower()
+TIER_LOCAL_MAX_CHARS = int(os.getenv("TIER_LOCAL_MAX_CHARS", "1500"))
+TIER_LOCAL_MIN_STRUCTURE = float(os.getenv("TIER_LOCAL_MIN_STRUCTURE", "0.6"))
+
+
+def estimate_tokens(transcript: str) -> int:
+    """Rough prompt size of one extraction call (~4 characters per token)."""
+    return (len(SYSTEM_PROMPT) + len(EXAMPLE_OUTPUT) + len(transcript)) // 4
+
+
+@dataclass
+class Extraction:
+    tasks: List[TaskCreate] = field(default_factory=list)
+    backend: str = ""
+    # set when the local tier served a transcript the LLM tier should have handled
+    fallback_reason: Optional[str] = None
+    # estimated prompt tokens the pre-filter removed
+    tokens_saved: int = 0
+
+    @property
+    def cacheable(self) -> bool:
+        """Only model output is worth caching; local results are cheaper to recompute than to look up."""
+        return self.backend == "llm"
+
+
+class TaskExtractor(Protocol):
+    name: str
+
+    def needs_llm(self, transcript: str) -> bool:
+        """Whether `transcript` would go to the model (and so is worth an extraction cache lookup)."""
+
+    async def extract(self, transcript: str) -> Extraction:
+        ...
+
+    def stream(self, transcript: str, result: Extraction) -> AsyncIterator[TaskCreate]:
+        """Yield tasks as they are extracted; `result` is filled in as the stream progresses."""
+
+
+class HeuristicExtractor:
+    """Regex extraction (app.utils.exact_details): microseconds, no model call."""
+
+    name = "heuristic"
+
+    def needs_llm(self, transcript: str) -> bool:
+        return False
+
+    async def extract(self, transcript: str) -> Extraction:
+        return Extraction(exact_details.extract_tasks(transcript), self.name)
+
+    async def stream(self, transcript: str, result: Extraction) -> AsyncIterator[TaskCreate]:
+        result.backend = self.name
+        for task in exact_details.extract_tasks(transcript):
+            result.tasks.append(task.model_copy(deep=True))
+            yield task
+
+
+class LLMExtractor:
+    """
+    extract_tasks / stream_tasks on the pre-filtered transcript. Token spend is capped by the shared
+    rate limiter (OPENAI_TOKENS_PER_MINUTE), which refuses with LLMUnavailableError("rate_limited").
+    """
+
+    name = "llm"
+
+    def __init__(self, prefilter: PrefilterConfig = PrefilterConfig()):
+        self.prefilter = prefilter
+
+    def needs_llm(self, transcript: str) -> bool:
+        return True
+
+    def _prepare(self, transcript: str, result: Extraction) -> str:
+        """Pre-filter `transcript`; returns the text to send."""
+        if self.prefilter.enabled:
+            with span("prefilter") as s:
+                filtered = prefilter_transcript(transcript, self.prefilter)
+                if s is not None:
+                    s.attributes.update(
+                        tokens_before=filtered.tokens_before,
+                        tokens_after=filtered.tokens_after,
+                        lines_dropped=filtered.lines_dropped,
+                        truncated=filtered.truncated,
+                    )
+            PREFILTER_TOKENS.labels("input").inc(filtered.tokens_before)
+            PREFILTER_TOKENS.labels("output").inc(filtered.tokens_after)
+            logging.info(
+                "Pre-filter saved %d of %d estimated tokens", filtered.tokens_saved, filtered.tokens_before,
+                extra={
+                    "tokens_before": filtered.tokens_before,
+                    "tokens_after": filtered.tokens_after,
+                    "lines_dropped": filtered.lines_dropped,
+                    "duplicates_dropped": filtered.duplicates_dropped,
+                    "truncated": filtered.truncated,
+                },
             )
+            result.tokens_saved = filtered.tokens_saved
+            transcript = filtered.text
+        return transcript
+
+    async def extract(self, transcript: str) -> Extraction:
+        result = Extraction(backend=self.name)
+        transcript = self._prepare(transcript, result)
+        # only small talk / attendee lists (the budget never empties a transcript)
+        if transcript:
+            result.tasks = await extract_tasks(transcript)
+        return result
+
+    async def stream(self, transcript: str, result: Extraction) -> AsyncIterator[TaskCreate]:
+        transcript = self._prepare(transcript, result)
+        result.backend = self.name
+        if not transcript:
+            return
+        async for task in stream_tasks(transcript):
+            result.tasks.append(task.model_copy(deep=True))
+            yield task
+
+
+class TieredExtractor:
+    """
+    Transcripts up to `max_local_chars`, or whose lines are mostly explicit action items
+    (structure_score >= `min_structure`), are served by `local`; the rest escalate to `llm`.
+    If the LLM tier fails or refuses the call (rate limited, circuit open), `local`
+    serves the transcript instead.
+    """
+
+    name = "tiered"
+
+    def __init__(self, local: TaskExtractor, llm: TaskExtractor, max_local_chars: int, min_structure: float):
+        self.local = local
+        self.llm = llm
+        self.max_local_chars = max_local_chars
+        self.min_structure = min_structure
 
-            # --- robust extraction of the "content" ---
-            content = None
-
-            # Different SDKs/response shapes exist; handle defensively
-            if hasattr(resp, "choices") and len(resp.choices) > 0:
-                choice = resp.choices[0]
-                # Newer SDK shapes may have `.message.content`, older may have `.text` or `.message["content"]`
-                if getattr(choice, "message", None) is not None:
-                    content = getattr(choice.message, "content", None)
-                    if content is None and isinstance(choice.message, dict):
-                        content = choice.message.get("content")
-                elif hasattr(choice, "text"):
-                    content = choice.text
-                elif hasattr(choice, "content"):
-                    content = choice.content
-                else:
-                    # fallback to string representation
-                    content = str(choice)
-            else:
-                # fallback if SDK puts text elsewhere
-                content = getattr(resp, "content", None) or str(resp)
-
-            if content is None:
-                raise RuntimeError("OpenAI response contains no content.")
-
-            # If it's already a dict/list, keep it. If it's a string, parse JSON out of it.
-            parsed = None
-            if isinstance(content, (dict, list)):
-                parsed = content
-            else:
-                text = str(content).strip()
-                # The model might sometimes prepend explanation; try to find the first JSON bracket
-                first_brace = min(
-                    (idx for idx in (text.find("["), text.find("{")) if idx != -1),
-                    default=0
-                )
-                if first_brace > 0:
-                    text = text[first_brace:]
-                parsed = json.loads(text)  # may raise
-
-            # Normalize parsed into tasks list:
-            if isinstance(parsed, list):
-                tasks_raw = parsed
-            elif isinstance(parsed, dict) and "tasks" in parsed and isinstance(parsed["tasks"], list):
-                tasks_raw = parsed["tasks"]
-            else:
-                # If the model returned a dict of items, try to coerce its values to a list
-                if isinstance(parsed, dict):
-                    # sometimes model returns {"1": {...}, "2": {...}}
-                    possible = []
-                    for v in parsed.values():
-                        if isinstance(v, dict):
-                            possible.append(v)
-                    tasks_raw = possible
-                else:
-                    tasks_raw = []
-
-            result: List[TaskCreate] = []
-            for raw in tasks_raw:
-                if not isinstance(raw, dict):
-                    logging.warning("Skipping non-dict task element: %r", raw)
-                    continue
-
-                # flexible key mapping
-                text_val = raw.get("text") or raw.get("title") or raw.get("task") or ""
-                id_val = raw.get("id") or raw.get("task_id") or str(uuid.uuid4())
-                pr = (raw.get("priority") or "").lower() if raw.get("priority") else ""
-                if pr not in ("low", "medium", "high"):
-                    pr = "medium"  # default fallback
-                tags_val = raw.get("tags") or raw.get("labels") or []
-                if not isinstance(tags_val, list):
-                    # if model returns comma-joined tags string, split it
-                    if isinstance(tags_val, str):
-                        tags_val = [t.strip() for t in tags_val.split(",") if t.strip()]
-                    else:
-                        tags_val = []
-
-                # Build pydantic model (this will validate types too)
-                try:
-                    task_obj = TaskCreate(id=id_val, text=text_val, priority=pr, tags=tags_val)
-                    result.append(task_obj)
-                except Exception as e:
-                    logging.exception("Failed to construct TaskCreate for raw=%r: %s", raw, e)
-                    # skip invalid entries
+    def needs_llm(self, transcript: str) -> bool:
+        if len(transcript) <= self.max_local_chars:
+            return False
+        return exact_details.structure_score(transcript) < self.min_structure
 
+    @staticmethod
+    def _fallback_reason(e: Exception) -> str:
+        return e.reason if isinstance(e, LLMUnavailableError) else "error"
+
+    async def extract(self, transcript: str) -> Extraction:
+        if not self.needs_llm(transcript):
+            return await self.local.extract(transcript)
+        try:
+            return await self.llm.extract(transcript)
+        except Exception as e:
+            reason = self._fallback_reason(e)
+            logging.warning("LLM tier unavailable (%s: %s); using the %s tier", reason, e, self.local.name)
+            EXTRACTION_FALLBACKS.labels(reason).inc()
+            result = await self.local.extract(transcript)
+            result.fallback_reason = reason
             return result
 
-        except (APITimeoutError, asyncio.TimeoutError) as e:
-            logging.warning("OpenAI timeout (attempt %d/%d): %s", attempt, max_retries, e)
-            if attempt == max_retries:
-                raise RuntimeError("OpenAI request timed out")
-        except APIError as e:
-            logging.warning("OpenAI API error (attempt %d/%d): %s", attempt, max_retries, e)
-            if attempt == max_retries:
-                raise RuntimeError(f"OpenAI API error: {str(e)}")
-        except json.JSONDecodeError as e:
-            logging.exception("JSON decode error when parsing OpenAI response (attempt %d/%d): %s", attempt, max_retries, e)
-            if attempt == max_retries:
-                raise RuntimeError(f"Failed to parse OpenAI response as JSON: {str(e)}")
+    async def stream(self, transcript: str, result: Extraction) -> AsyncIterator[TaskCreate]:
+        if not self.needs_llm(transcript):
+            async for task in self.local.stream(transcript, result):
+                yield task
+            return
+        try:
+            async for task in self.llm.stream(transcript, result):
+                yield task
+            return
         except Exception as e:
-            logging.exception("Unexpected error in extract_tasks (attempt %d/%d): %s", attempt, max_retries, e)
-            # fail fast for unexpected exceptions
-            raise RuntimeError(f"Unexpected error extracting tasks: {e}")
+            if result.tasks:
+                # part of the model's answer is already out; mixing in local tasks would duplicate them
+                raise
+            reason = self._fallback_reason(e)
+            logging.warning("LLM tier unavailable (%s: %s); using the %s tier", reason, e, self.local.name)
+            EXTRACTION_FALLBACKS.labels(reason).inc()
 
-        # exponential backoff before retrying
-        await asyncio.sleep(retry_base_delay * (2 ** (attempt - 1)))
+        result.fallback_reason = reason
+        async for task in self.local.stream(transcript, result):
+            yield task
 
-    # should not reach here
-    return []
+
+def make_extractor(backend: str) -> TaskExtractor:
+    if backend == "llm":
+        return LLMExtractor(PREFILTER)
+    if backend == "heuristic":
+        return HeuristicExtractor()
+    if backend == "tiered":
+        return TieredExtractor(
+            HeuristicExtractor(), LLMExtractor(PREFILTER), TIER_LOCAL_MAX_CHARS, TIER_LOCAL_MIN_STRUCTURE
+        )
+    raise ValueError(f"Unknown EXTRACTOR_BACKEND {backend!r}; expected llm, heuristic or tiered")
+
+
+# the backend transcript_service extracts with
+extractor: TaskExtractor = make_extractor(EXTRACTOR_BACKEND)
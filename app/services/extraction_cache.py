@@ -0,0 +1,193 @@
+# app/services/extraction_cache.py
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.db import AsyncSessionLocal
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.schemas.task import TaskCreate
+
+CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "512"))
+CACHE_PERSISTENT = os.getenv("EXTRACTION_CACHE_PERSISTENT", "true").lower() in ("1", "true", "yes")
+# how often (per process) expired rows are deleted from the database tier; 0 = never
+CACHE_SWEEP_INTERVAL_SECONDS = int(os.getenv("EXTRACTION_CACHE_SWEEP_INTERVAL_SECONDS", "3600"))
+CACHE_SWEEP_BATCH = 1000
+
+
+def make_key(transcript: str, model: str, prompt_version: str) -> str:
+    """Content address of an extraction: same sanitized text + model + prompt => same tasks."""
+    h = hashlib.sha256()
+    for part in (model, prompt_version, transcript):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def expired_entries_delete(batch: int = CACHE_SWEEP_BATCH) -> sa.Delete:
+    """
+    DELETE of up to `batch` expired rows (found through ix_extraction_cache_expires_at). SKIP LOCKED
+    lets replicas sweep at the same time without waiting on each other.
+    """
+    expired = (
+        sa.select(ExtractionCacheEntry.key)
+        .where(ExtractionCacheEntry.expires_at < sa.func.now())
+        .limit(batch)
+        .with_for_update(skip_locked=True)
+    )
+    return sa.delete(ExtractionCacheEntry).where(ExtractionCacheEntry.key.in_(expired))
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of extraction results.
+
+    - memory: per-process LRU with TTL and max-entries eviction
+    - database: `extraction_cache` table, survives restarts and is shared across replicas;
+      a database hit is promoted into the memory tier. `get` ignores expired rows, and `set` starts
+      a background sweep deleting them at most every `sweep_interval` seconds
+    """
+
+    def __init__(self, ttl_seconds: int = CACHE_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES,
+                 persistent: bool = CACHE_PERSISTENT, sweep_interval: int = CACHE_SWEEP_INTERVAL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0}
+
+    # --- memory tier ---
+
+    def _get_memory(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, tasks = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return tasks
+
+    def _set_memory(self, key: str, tasks: List[Dict[str, Any]]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, tasks)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- database tier expiry ---
+
+    async def sweep(self) -> int:
+        """Delete every expired row of the database tier, in batches; returns how many went."""
+        deleted = 0
+        async with AsyncSessionLocal() as session:
+            while True:
+                result = await session.execute(expired_entries_delete(CACHE_SWEEP_BATCH))
+                await session.commit()
+                deleted += result.rowcount
+                if result.rowcount < CACHE_SWEEP_BATCH:
+                    return deleted
+
+    async def _run_sweep(self) -> None:
+        try:
+            deleted = await self.sweep()
+        except Exception:
+            logging.warning("Extraction cache sweep failed", exc_info=True)
+            return
+        if deleted:
+            logging.info("Extraction cache sweep deleted %d expired entries", deleted)
+
+    def _maybe_sweep(self) -> None:
+        """Start a background sweep if the last one is `sweep_interval` old and none is running."""
+        if not self.sweep_interval:
+            return
+        now = time.monotonic()
+        if now < self._next_sweep or (self._sweep_task is not None and not self._sweep_task.done()):
+            return
+        self._next_sweep = now + self.sweep_interval
+        self._sweep_task = asyncio.create_task(self._run_sweep())
+
+    # --- public API ---
+
+    async def get(self, key: str) -> Optional[List[TaskCreate]]:
+        tasks = self._get_memory(key)
+        if tasks is not None:
+            self.stats["memory_hits"] += 1
+            return [TaskCreate(**t) for t in tasks]
+
+        if self.persistent:
+            try:
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        sa.select(ExtractionCacheEntry.tasks).where(
+                            ExtractionCacheEntry.key == key,
+                            sa.or_(
+                                ExtractionCacheEntry.expires_at.is_(None),
+                                ExtractionCacheEntry.expires_at > sa.func.now(),
+                            ),
+                        )
+                    )
+                    tasks = result.scalar_one_or_none()
+            except Exception:
+                logging.warning("Extraction cache lookup failed; treating as miss", exc_info=True)
+                tasks = None
+
+            if tasks is not None:
+                self.stats["db_hits"] += 1
+                self._set_memory(key, tasks)
+                return [TaskCreate(**t) for t in tasks]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, tasks: List[TaskCreate], *, model: str, prompt_version: str) -> None:
+        dumped = [t.model_dump() for t in tasks]
+        self._set_memory(key, dumped)
+
+        if not self.persistent:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                expires_at = sa.func.now() + timedelta(seconds=self.ttl_seconds)
+                stmt = insert(ExtractionCacheEntry).values(
+                    key=key,
+                    model=model,
+                    prompt_version=prompt_version,
+                    tasks=dumped,
+                    expires_at=expires_at,
+                )
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[ExtractionCacheEntry.key],
+                    set_={"tasks": stmt.excluded.tasks, "expires_at": stmt.excluded.expires_at},
+                )
+                await session.execute(stmt)
+                await session.commit()
+        except Exception:
+            # the memory tier still has it; a failed write only costs a future miss
+            logging.warning("Extraction cache write failed", exc_info=True)
+        self._maybe_sweep()
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["db_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hits": hits,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._entries),
+        }
+
+
+# module-level singleton shared by all requests in this process
+extraction_cache = ExtractionCache()
@@ -0,0 +1,216 @@
+# app/services/job_service.py
+import os
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal
+from app.core.tracing import start_trace, span
+from app.models.transcript_job import TranscriptJob, JobStatusEnum
+from app.schemas.task import TaskRead
+from app.services.ai_service import LLMUnavailableError
+from app.services.task_service import create_tasks, get_tasks_by_source_prefix
+from app.services.transcript_service import extract_transcript_tasks
+
+JOB_WORKERS = int(os.getenv("TRANSCRIPT_JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("TRANSCRIPT_JOB_POLL_INTERVAL", "2.0"))
+# a job left "running" this long is assumed orphaned by a dead worker and is picked up again
+JOB_STALE_AFTER_SECONDS = int(os.getenv("TRANSCRIPT_JOB_STALE_AFTER_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("TRANSCRIPT_JOB_MAX_ATTEMPTS", "3"))
+
+
+async def enqueue_job(db: AsyncSession, transcript: str) -> TranscriptJob:
+    job = TranscriptJob(transcript=transcript)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    job_pool.notify()
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: str) -> Optional[TranscriptJob]:
+    return await db.get(TranscriptJob, job_id)
+
+
+async def claim_next_job() -> Optional[Tuple[str, str, int]]:
+    """
+    Atomically move the oldest runnable job to `running` and return (id, transcript, attempts).
+    SKIP LOCKED lets any number of workers, in any number of replicas, poll the same table.
+    A queued job is runnable once its `not_before` (if any) has passed.
+    A stale `running` job that already used all its attempts (e.g. it keeps crashing the worker)
+    is marked `failed` instead of being claimed again.
+    """
+    stale_before = sa.func.now() - timedelta(seconds=JOB_STALE_AFTER_SECONDS)
+    stale = sa.and_(TranscriptJob.status == JobStatusEnum.running, TranscriptJob.started_at < stale_before)
+    give_up = (
+        sa.update(TranscriptJob)
+        .where(stale, TranscriptJob.attempts >= JOB_MAX_ATTEMPTS)
+        .values(
+            status=JobStatusEnum.failed,
+            error="Worker stopped responding on the last attempt",
+            finished_at=sa.func.now(),
+        )
+    )
+    next_id = (
+        sa.select(TranscriptJob.id)
+        .where(
+            sa.or_(
+                sa.and_(
+                    TranscriptJob.status == JobStatusEnum.queued,
+                    sa.or_(TranscriptJob.not_before.is_(None), TranscriptJob.not_before <= sa.func.now()),
+                ),
+                sa.and_(stale, TranscriptJob.attempts < JOB_MAX_ATTEMPTS),
+            )
+        )
+        .order_by(TranscriptJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        sa.update(TranscriptJob)
+        .where(TranscriptJob.id == next_id)
+        .values(
+            status=JobStatusEnum.running,
+            started_at=sa.func.now(),
+            attempts=TranscriptJob.attempts + 1,
+            not_before=None,
+        )
+        .returning(TranscriptJob.id, TranscriptJob.transcript, TranscriptJob.attempts)
+    )
+    async with AsyncSessionLocal() as session:
+        await session.execute(give_up)
+        row = (await session.execute(stmt)).first()
+        await session.commit()
+    return tuple(row) if row else None
+
+
+async def _set_job_status(
+    job_ids: List[str], status: JobStatusEnum, *, only_if: Optional[JobStatusEnum] = None, **values
+) -> None:
+    stmt = sa.update(TranscriptJob).where(TranscriptJob.id.in_(job_ids))
+    if only_if is not None:
+        stmt = stmt.where(TranscriptJob.status == only_if)
+    async with AsyncSessionLocal() as session:
+        await session.execute(stmt.values(status=status, **values))
+        await session.commit()
+
+
+async def run_job(job_id: str, transcript: str, attempts: int) -> None:
+    """Extract and persist the tasks of one claimed job, recording the outcome on the job row."""
+    with start_trace("transcript_job", job_id=job_id, attempt=attempts):
+        await _run_job(job_id, transcript, attempts)
+
+
+async def _run_job(job_id: str, transcript: str, attempts: int) -> None:
+    try:
+        with span("extract"):
+            tasks = await extract_transcript_tasks(transcript)
+        # Stable source ids make a re-run of the same job (after a crash) skip already-saved tasks
+        for i, task in enumerate(tasks):
+            task.source_id = f"job:{job_id}:{i}"
+        created: List[TaskRead] = []
+        with span("persist", tasks=len(tasks)):
+            async with AsyncSessionLocal() as session:
+                if tasks:
+                    await create_tasks(session, tasks)
+                # create_tasks only returns rows it inserted; an earlier attempt may have saved some
+                created = await get_tasks_by_source_prefix(session, f"job:{job_id}:")
+    except LLMUnavailableError as e:
+        # refused before reaching OpenAI (rate limited / circuit open): not the job's fault, so it
+        # gets its attempt back and waits until the LLM is expected to take calls again
+        delay = max(e.retry_after, JOB_POLL_INTERVAL)
+        logging.warning("Transcript job %s deferred %.0fs: LLM unavailable (%s)", job_id, delay, e.reason)
+        await _set_job_status(
+            [job_id],
+            JobStatusEnum.queued,
+            attempts=TranscriptJob.attempts - 1,
+            not_before=sa.func.now() + timedelta(seconds=delay),
+            error=str(e),
+        )
+        return
+    except Exception as e:
+        logging.exception("Transcript job %s failed (attempt %d/%d)", job_id, attempts, JOB_MAX_ATTEMPTS)
+        if attempts < JOB_MAX_ATTEMPTS:
+            await _set_job_status([job_id], JobStatusEnum.queued, error=str(e))
+        else:
+            await _set_job_status([job_id], JobStatusEnum.failed, error=str(e), finished_at=sa.func.now())
+        return
+
+    await _set_job_status(
+        [job_id],
+        JobStatusEnum.succeeded,
+        result=[t.model_dump(mode="json") for t in created],
+        error=None,
+        finished_at=sa.func.now(),
+    )
+
+
+class JobWorkerPool:
+    """Fixed number of asyncio workers draining the `transcript_jobs` table."""
+
+    def __init__(self, workers: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: Dict[int, str] = {}
+
+    def notify(self) -> None:
+        """Wake an idle worker right away instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            try:
+                claimed = await claim_next_job()
+            except Exception:
+                logging.exception("Job worker %d failed to claim a job", n)
+                claimed = None
+
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._running[n] = claimed[0]
+            try:
+                await run_job(*claimed)
+            except Exception:
+                # e.g. the database went away while recording the outcome; the job stays `running`
+                # and is re-claimed once stale, this worker carries on
+                logging.exception("Job worker %d failed to run job %s", n, claimed[0])
+            finally:
+                self._running.pop(n, None)
+
+    def start(self) -> None:
+        if self._tasks or self.workers <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logging.info("Started %d transcript job workers", self.workers)
+
+    async def stop(self) -> None:
+        interrupted = list(self._running.values())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        # hand interrupted jobs back to the queue; if this fails they are re-claimed once stale
+        if interrupted:
+            try:
+                await _set_job_status(interrupted, JobStatusEnum.queued, only_if=JobStatusEnum.running)
+            except Exception:
+                logging.exception("Failed to requeue interrupted transcript jobs %s", interrupted)
+
+
+job_pool = JobWorkerPool()
@@ -0,0 +1,69 @@
+# app/services/task_response_cache.py
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.schemas.task import TaskPage, TaskReadList
+
+# serialized list/filter responses kept per process; 0 disables the cache (ETags still work)
+RESPONSE_CACHE_SIZE = int(os.getenv("TASK_RESPONSE_CACHE_SIZE", "128"))
+
+
+def compute_etag(version: int, scope: str, params: Dict[str, Any]) -> str:
+    """
+    Strong ETag of a list/filter response: the tasks table version plus everything that
+    shapes the response (endpoint, filters, sort, page size, cursor).
+    """
+    material = json.dumps({"scope": scope, "params": params}, sort_keys=True, default=str)
+    digest = hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: `*` or any listed tag, W/ prefix ignored."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def serialize_page(page: TaskPage) -> Tuple[bytes, Optional[str]]:
+    return TaskReadList.dump_json(page.tasks), page.next_cursor
+
+
+class ResponseCache:
+    """
+    Per-process LRU of serialized responses keyed by ETag.
+    Entries never go stale: a write bumps the version, which changes every ETag, and the
+    orphaned entries simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[str]]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, etag: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        entry = self._entries.get(etag)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(etag)
+        self.stats["hits"] += 1
+        return entry
+
+    def set(self, etag: str, body: bytes, next_cursor: Optional[str]) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[etag] = (body, next_cursor)
+        self._entries.move_to_end(etag)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+response_cache = ResponseCache()
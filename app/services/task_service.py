@@ -1,55 +1,287 @@
 # app/services/task_service.py
-from typing import List, Optional
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import asc, desc, or_
+from sqlalchemy import Float, and_, asc, delete, desc, func, literal, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 
 from app.models.task import Task, StatusEnum, PriorityEnum
-from app.schemas.task import TaskCreate, TaskUpdate, TaskRead
+from app.models.task_collection_version import TaskCollectionVersion
+from app.schemas.task import TaskCreate, TaskUpdate, TaskRead, TaskPage, TaskReadList
+from app.schemas.task_filter import TaskFilterInput
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+# rows per INSERT statement; keeps bind parameters well under asyncpg's 32767 limit
+INSERT_CHUNK_SIZE = 1000
+
+# every column a TaskRead needs (i.e. not the search_vector document)
+READ_COLUMNS = [c for c in Task.__table__.c if c.key != "search_vector"]
+
+SEARCH_MODES = ("substring", "fulltext")
+SEARCH_CONFIG = "english"
+
+
+async def get_collection_version(db: AsyncSession) -> int:
+    """Current change counter of the tasks table (a primary-key lookup of one row)."""
+    version = await db.scalar(select(TaskCollectionVersion.version).where(TaskCollectionVersion.id == 1))
+    return version or 0
+
+
+async def bump_collection_version(db: AsyncSession) -> None:
+    """
+    Increment the change counter inside the caller's transaction, right before it commits.
+    The row lock is held only until that commit, and the bump becomes visible together with
+    the change it describes.
+    """
+    table = TaskCollectionVersion.__table__
+    stmt = (
+        insert(table)
+        .values(id=1, version=1)
+        .on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={"version": table.c.version + 1, "updated_at": func.now()},
+        )
+    )
+    await db.execute(stmt)
 
 
 async def create_tasks(db: AsyncSession, tasks: List[TaskCreate]) -> List[TaskRead]:
-    created: List[Task] = []
-    for t in tasks:
+    """
+    Insert tasks with one `INSERT ... ON CONFLICT (source_id) DO NOTHING RETURNING *` per
+    INSERT_CHUNK_SIZE rows, all in a single transaction.
+    Tasks whose source_id already exists (in the table or earlier in `tasks`) are skipped;
+    the created tasks are returned in input order.
+    """
+    return [task for _, task in await create_tasks_indexed(db, tasks)]
+
+
+async def create_tasks_indexed(db: AsyncSession, tasks: List[TaskCreate]) -> List[Tuple[int, TaskRead]]:
+    """create_tasks, returning each created task with its index in `tasks`."""
+    rows = []
+    # index in `tasks` of each row's task
+    origin = {}
+    seen_sources = set()
+    for index, t in enumerate(tasks):
         # Avoid duplicates based on source_id
         if t.source_id:
-            q = await db.execute(select(Task).where(Task.source_id == t.source_id))
-            if q.scalar_one_or_none():
+            if t.source_id in seen_sources:
                 continue
+            seen_sources.add(t.source_id)
+        row = t.model_dump()
+        row["id"] = str(uuid.uuid4())
+        origin[row["id"]] = index
+        rows.append(row)
+
+    if not rows:
+        return []
 
-        task = Task(**t.model_dump())
-        db.add(task)
-        created.append(task)
+    table = Task.__table__
+    created = []
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        stmt = (
+            insert(table)
+            .values(rows[start:start + INSERT_CHUNK_SIZE])
+            .on_conflict_do_nothing(index_elements=[table.c.source_id])
+            .returning(*READ_COLUMNS)
+        )
+        result = await db.execute(stmt)
+        created.extend(result.mappings().all())
 
+    if created:
+        await bump_collection_version(db)
     await db.commit()
-    # Refresh to populate autogenerated fields (id, timestamps)
-    for task in created:
-        await db.refresh(task)
 
-    return [TaskRead.model_validate(task) for task in created]
+    # RETURNING order is not guaranteed; restore input order
+    created.sort(key=lambda row: origin[row["id"]])
+    return [(origin[row["id"]], TaskRead.model_validate(dict(row))) for row in created]
+
+
+async def get_tasks_by_source_prefix(db: AsyncSession, prefix: str) -> List[TaskRead]:
+    """
+    Tasks whose source_id starts with `prefix`, e.g. every task a transcript job saved across
+    all of its attempts ("job:<id>:"), in source_id order.
+    """
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    result = await db.execute(select(*READ_COLUMNS).where(Task.source_id.like(pattern, escape="\\")))
+    rows = result.mappings().all()
+
+    def order(row) -> tuple:
+        # "job:x:10" must come after "job:x:9": numeric suffixes compare as numbers
+        suffix = row["source_id"][len(prefix):]
+        return (0, int(suffix), "") if suffix.isdigit() else (1, 0, suffix)
+
+    return [TaskRead.model_validate(dict(row)) for row in sorted(rows, key=order)]
+
+
+# Columns clients may sort by; pagination uses (column, id) as the keyset
+SORTABLE_COLUMNS = {
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "priority": Task.priority,
+    "status": Task.status,
+    "text": Task.text,
+}
+
+
+def _is_nullable(column) -> bool:
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
+def _cursor_value(sort_by: str, value, nullable: bool):
+    """Validate the sort value of a decoded cursor; ValueError for anything encode_cursor did not write."""
+    if value is None:
+        if not nullable:
+            raise ValueError("Invalid cursor")
+        return None
+    try:
+        if sort_by in ("created_at", "updated_at"):
+            return datetime.fromisoformat(value)
+        if sort_by == "priority":
+            return PriorityEnum(value)
+        if sort_by == "status":
+            return StatusEnum(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if sort_by == "text":
+        if not isinstance(value, str):
+            raise ValueError("Invalid cursor")
+    elif isinstance(value, bool) or not isinstance(value, (int, float)):
+        # computed sort keys (search relevance) are numbers
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def _seek(sort_column, value, last_id: str, descending: bool, nullable: bool):
+    """Rows after (value, last_id) in ORDER BY sort_column, id (NULL sorting as the largest value)."""
+    if value is None:
+        after_null = Task.id < last_id if descending else Task.id > last_id
+        rows = and_(sort_column.is_(None), after_null)
+        # descending, NULLs come first: every non-NULL row is still ahead
+        return or_(rows, sort_column.is_not(None)) if descending else rows
+    key = tuple_(sort_column, Task.id)
+    bound = tuple_(literal(value, sort_column.type), literal(last_id))
+    if descending:
+        return key < bound
+    # only nullable columns pay for the OR (it keeps the index from bounding the scan)
+    return or_(key > bound, sort_column.is_(None)) if nullable else key > bound
+
+
+def _paginate(query, sort_by: str, order: str, limit: Optional[int], cursor: Optional[str], sort_columns=None):
+    """
+    Order `query` by (sort column, id) and, when `limit` is set, seek past `cursor`.
+    Seeking with a row comparison (instead of OFFSET) costs the same on every page.
+    `sort_columns` may add computed sort keys (e.g. search relevance) to SORTABLE_COLUMNS.
+    """
+    sort_columns = {**SORTABLE_COLUMNS, **(sort_columns or {})}
+    # Sorting with safe fallback
+    if sort_by not in sort_columns:
+        sort_by = "created_at"
+    sort_column = sort_columns[sort_by]
+    descending = order.lower() != "asc"
+    direction = desc if descending else asc
 
+    nullable = _is_nullable(sort_column)
+    if cursor:
+        position = decode_cursor(cursor)
+        if position.get("s") != sort_by or position.get("o") != ("desc" if descending else "asc"):
+            raise ValueError("Cursor does not match the requested sort order")
+        value, last_id = _cursor_value(sort_by, position.get("v"), nullable), position.get("id")
+        if not isinstance(last_id, str):
+            raise ValueError("Invalid cursor")
+        query = query.where(_seek(sort_column, value, last_id, descending, nullable))
 
-async def list_tasks(db: AsyncSession) -> List[TaskRead]:
-    result = await db.execute(select(Task))
-    tasks = result.scalars().all()
-    return [TaskRead.model_validate(t) for t in tasks]
+    # NULL sorts as the largest value (Postgres' default, so the (column, id) indexes still apply)
+    primary = direction(sort_column).nulls_first() if descending else direction(sort_column).nulls_last()
+    query = query.order_by(primary, direction(Task.id))
+    if limit:
+        # one extra row tells us whether there is a next page
+        query = query.limit(limit + 1)
+    return query, sort_by, descending
+
+
+def _page(rows, sort_by: str, descending: bool, limit: Optional[int]) -> TaskPage:
+    """
+    Build a page from Core rows of READ_COLUMNS (plus `relevance` when ranked).
+    All rows are validated in one TypeAdapter call instead of one model_validate per ORM object.
+    """
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        value = getattr(last, sort_by)
+        next_cursor = encode_cursor({
+            "s": sort_by,
+            "o": "desc" if descending else "asc",
+            "v": value.isoformat() if isinstance(value, datetime) else getattr(value, "value", value),
+            "id": last.id,
+        })
+    tasks = TaskReadList.validate_python(rows, from_attributes=True)
+    # already validated; skip TaskPage re-checking every element
+    return TaskPage.model_construct(tasks=tasks, next_cursor=next_cursor)
+
+
+async def list_tasks(
+    db: AsyncSession,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> TaskPage:
+    query, sort_by, descending = _paginate(select(*READ_COLUMNS), sort_by, order, limit, cursor)
+    rows = (await db.execute(query)).all()
+    return _page(rows, sort_by, descending, limit)
+
+
+def _patch_values(patch: TaskUpdate) -> dict:
+    """Column values of a patch; enum fields are validated here so a bad value is a 400, not a DB error."""
+    values = {k: v for k, v in patch.model_dump(exclude_unset=True).items() if v is not None}
+    if "status" in values:
+        values["status"] = StatusEnum(values["status"])
+    if "priority" in values:
+        values["priority"] = PriorityEnum(values["priority"])
+    return values
 
 
 async def update_task(
-    db: AsyncSession, task_id: str, patch: TaskUpdate
+    db: AsyncSession,
+    task_id: str,
+    patch: TaskUpdate,
+    expected_versions: Optional[List[int]] = None,
 ) -> Optional[TaskRead]:
-    task = await db.get(Task, task_id)
-    if not task:
-        return None
+    """
+    Apply `patch` with one `UPDATE tasks ... WHERE id = :id [AND version IN (...)] RETURNING *`.
+    Returns None when no row matched: either the task does not exist or, with
+    `expected_versions`, it was changed by someone else since the caller read it.
+    """
+    table = Task.__table__
+    conditions = [table.c.id == task_id]
+    if expected_versions is not None:
+        conditions.append(table.c.version.in_(expected_versions))
 
-    for field, value in patch.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
+    values = _patch_values(patch)
+    if not values:
+        # nothing to change: still one statement, and still honours the version check
+        row = (await db.execute(select(*READ_COLUMNS).where(*conditions))).mappings().first()
+        return TaskRead.model_validate(dict(row)) if row else None
 
-    await db.commit()
-    await db.refresh(task)
+    stmt = (
+        update(table)
+        .where(*conditions)
+        .values(**values, version=table.c.version + 1)
+        .returning(*READ_COLUMNS)
+    )
+    row = (await db.execute(stmt)).mappings().first()
+    if row is None:
+        await db.rollback()
+        return None
 
-    return TaskRead.model_validate(task)
+    await bump_collection_version(db)
+    await db.commit()
+    return TaskRead.model_validate(dict(row))
 
 
 async def delete_task(db: AsyncSession, task_id: str) -> bool:
@@ -58,44 +290,157 @@ async def delete_task(db: AsyncSession, task_id: str) -> bool:
         return False
 
     await db.delete(task)
+    await bump_collection_version(db)
     await db.commit()
     return True
 
 
-async def filter_tasks(
-    db: AsyncSession,
+def filter_conditions(
     status: Optional[StatusEnum] = None,
     priority: Optional[PriorityEnum] = None,
     keyword: Optional[str] = None,
     tags: Optional[List[str]] = None,
-    sort_by: str = "created_at",
-    order: str = "desc",
-    match_all_tags: bool = True,  # NEW: choose AND/OR behavior
-) -> List[TaskRead]:
-    query = select(Task)
+    match_all_tags: bool = True,
+    search_mode: str = "substring",
+):
+    """
+    WHERE clauses for a task filter, plus the relevance expression when `keyword` is a full-text search.
+
+    `keyword` matching depends on `search_mode`:
+    - "substring": case-insensitive substring of the text (served by the pg_trgm index)
+    - "fulltext": stemmed word search with web-style syntax ("fix -legacy", "\"memory leak\"",
+      "a or b"), served by the search_vector GIN index
+    """
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"search_mode must be one of {', '.join(SEARCH_MODES)}")
+
+    conditions = []
+    rank = None
 
     if status:
-        query = query.where(Task.status == status)
+        conditions.append(Task.status == status)
     if priority:
-        query = query.where(Task.priority == priority)
-    if keyword:
-        query = query.where(Task.text.ilike(f"%{keyword}%"))
+        conditions.append(Task.priority == priority)
+    if keyword and search_mode == "fulltext":
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, keyword)
+        conditions.append(Task.search_vector.op("@@")(ts_query))
+        rank = func.ts_rank_cd(Task.search_vector, ts_query, type_=Float)
+    elif keyword:
+        escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append(Task.text.ilike(f"%{escaped}%", escape="\\"))
     if tags:
         if match_all_tags:
             # Require ALL tags (AND)
             for tag in tags:
-                query = query.where(Task.tags.contains([tag]))
+                conditions.append(Task.tags.contains([tag]))
         else:
-            # Match ANY tag (OR)
-            query = query.where(or_(*[Task.tags.contains([tag]) for tag in tags]))
+            # Match ANY tag (OR): one && (overlap) condition, served by the GIN index in a single scan
+            conditions.append(Task.tags.overlap(tags))
 
-    # Sorting with safe fallback
-    sort_column = getattr(Task, sort_by, Task.created_at)
-    if order.lower() == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
-
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-    return [TaskRead.model_validate(t) for t in tasks]
+    return conditions, rank
+
+
+def build_filter_query(
+    status: Optional[StatusEnum] = None,
+    priority: Optional[PriorityEnum] = None,
+    keyword: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    match_all_tags: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    search_mode: str = "substring",
+):
+    """
+    The SELECT behind filter_tasks, over READ_COLUMNS. Returns (query, sort_by, descending, ranked);
+    when `ranked`, rows also carry a `relevance` column.
+    """
+    conditions, rank = filter_conditions(status, priority, keyword, tags, match_all_tags, search_mode)
+    query = select(*READ_COLUMNS).where(*conditions)
+
+    if rank is not None and sort_by == "relevance":
+        query = query.add_columns(rank.label("relevance"))
+        query, sort_by, descending = _paginate(
+            query, sort_by, order, limit, cursor, sort_columns={"relevance": rank}
+        )
+        return query, sort_by, descending, True
+
+    query, sort_by, descending = _paginate(query, sort_by, order, limit, cursor)
+    return query, sort_by, descending, False
+
+
+async def filter_tasks(
+    db: AsyncSession,
+    status: Optional[StatusEnum] = None,
+    priority: Optional[PriorityEnum] = None,
+    keyword: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    match_all_tags: bool = True,  # NEW: choose AND/OR behavior
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    search_mode: str = "substring",
+) -> TaskPage:
+    """Filter and sort tasks (see filter_conditions); sort_by="relevance" ranks full-text matches."""
+    query, sort_by, descending, _ = build_filter_query(
+        status, priority, keyword, tags, sort_by, order, match_all_tags, limit, cursor, search_mode
+    )
+    rows = (await db.execute(query)).all()
+    return _page(rows, sort_by, descending, limit)
+
+
+def _selection_conditions(ids: Optional[List[str]], filters: Optional[TaskFilterInput]):
+    """WHERE clauses of a bulk operation; a filter must narrow the selection (no accidental "all")."""
+    if ids is not None:
+        return [Task.id.in_(ids)]
+    conditions, _ = filter_conditions(
+        filters.status, filters.priority, filters.keyword, filters.tags, search_mode=filters.search_mode
+    )
+    if not conditions:
+        raise ValueError("Bulk filter must set at least one of status, priority, keyword or tags")
+    return conditions
+
+
+async def bulk_update_tasks(
+    db: AsyncSession,
+    patch: TaskUpdate,
+    ids: Optional[List[str]] = None,
+    filters: Optional[TaskFilterInput] = None,
+) -> List[str]:
+    """
+    Apply `patch` to the tasks selected by `ids` or `filters` with one
+    `UPDATE ... RETURNING id` statement; returns the ids that were updated.
+    """
+    values = _patch_values(patch)
+    if not values:
+        raise ValueError("Patch has no fields to update")
+
+    table = Task.__table__
+    stmt = (
+        update(table)
+        .where(*_selection_conditions(ids, filters))
+        .values(**values, version=table.c.version + 1)
+        .returning(table.c.id)
+    )
+    affected = list((await db.execute(stmt)).scalars())
+    if affected:
+        await bump_collection_version(db)
+    await db.commit()
+    return affected
+
+
+async def bulk_delete_tasks(
+    db: AsyncSession,
+    ids: Optional[List[str]] = None,
+    filters: Optional[TaskFilterInput] = None,
+) -> List[str]:
+    """Delete the tasks selected by `ids` or `filters` with one `DELETE ... RETURNING id`."""
+    table = Task.__table__
+    stmt = delete(table).where(*_selection_conditions(ids, filters)).returning(table.c.id)
+    affected = list((await db.execute(stmt)).scalars())
+    if affected:
+        await bump_collection_version(db)
+    await db.commit()
+    return affected
@@ -0,0 +1,183 @@
+# app/services/transcript_service.py
+import os
+import asyncio
+import logging
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import EXTRACTIONS
+from app.core.tracing import span
+from app.services import ai_service
+from app.services.extraction_cache import extraction_cache, make_key
+from app.services.task_service import create_tasks_indexed
+from app.schemas.task import TaskCreate, TaskRead
+from app.schemas.transcript import TranscriptBatchItemResult
+from app.utils.singleflight import SingleFlight
+from app.utils.text import sanitize_transcript
+
+BATCH_CONCURRENCY = int(os.getenv("TRANSCRIPT_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.getenv("TRANSCRIPT_BATCH_MAX_ITEMS", "1000"))
+
+# concurrent submissions of the same transcript share one model call
+extraction_flights = SingleFlight()
+
+
+async def _extract_and_cache(transcript: str, key: str) -> List[TaskCreate]:
+    result = await ai_service.extractor.extract(transcript)
+    EXTRACTIONS.labels(result.backend).inc()
+
+    # a local-tier fallback is not what the model would have said; let the next request retry it
+    if result.cacheable:
+        await extraction_cache.set(
+            key, result.tasks, model=ai_service.MODEL, prompt_version=ai_service.EXTRACTION_VERSION
+        )
+    return result.tasks
+
+
+async def extract_transcript_tasks(transcript: str) -> List[TaskCreate]:
+    """
+    Extract tasks from an already-sanitized transcript with the configured extractor backend.
+    Transcripts the backend serves locally skip the cache. Identical transcripts (for the same
+    model + prompt version) are served from the extraction cache without calling the model;
+    concurrent misses for the same transcript are coalesced into one call.
+    """
+    if not ai_service.extractor.needs_llm(transcript):
+        result = await ai_service.extractor.extract(transcript)
+        EXTRACTIONS.labels(result.backend).inc()
+        return result.tasks
+
+    key = make_key(transcript, ai_service.MODEL, ai_service.EXTRACTION_VERSION)
+
+    with span("cache", key=key[:12]) as cache_span:
+        cached = await extraction_cache.get(key)
+        if cache_span is not None:
+            cache_span.attributes["hit"] = cached is not None
+    if cached is not None:
+        logging.info("Extraction cache hit for %s", key[:12])
+        return cached
+
+    tasks = await extraction_flights.do(key, lambda: _extract_and_cache(transcript, key))
+    # every caller gets its own copies; the shared list must not be mutated downstream
+    return [t.model_copy(deep=True) for t in tasks]
+
+
+async def stream_transcript_tasks(transcript: str) -> AsyncIterator[TaskCreate]:
+    """
+    Streaming counterpart of extract_transcript_tasks: yields tasks as the backend produces them.
+    A cached extraction is replayed immediately; a completed model stream is written to the cache.
+    """
+    extractor = ai_service.extractor
+    key = make_key(transcript, ai_service.MODEL, ai_service.EXTRACTION_VERSION)
+
+    if extractor.needs_llm(transcript):
+        cached = await extraction_cache.get(key)
+        if cached is not None:
+            logging.info("Extraction cache hit for %s", key[:12])
+            for task in cached:
+                yield task
+            return
+
+    result = ai_service.Extraction()
+    async for task in extractor.stream(transcript, result):
+        yield task
+    EXTRACTIONS.labels(result.backend).inc()
+
+    if result.cacheable:
+        await extraction_cache.set(
+            key, result.tasks, model=ai_service.MODEL, prompt_version=ai_service.EXTRACTION_VERSION
+        )
+
+
+class BatchTooLargeError(ValueError):
+    pass
+
+
+class InvalidBatchItemError(ValueError):
+    """One batch item is unusable (empty, malformed); its message is shown to the client."""
+
+
+BatchItem = Union[str, Exception]
+
+
+async def _iterate(items: Union[Iterable[BatchItem], AsyncIterator[BatchItem]]) -> AsyncIterator[BatchItem]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def process_transcript_batch(
+    db: AsyncSession,
+    items: Union[Iterable[BatchItem], AsyncIterator[BatchItem]],
+    *,
+    concurrency: Optional[int] = None,
+) -> List[TranscriptBatchItemResult]:
+    """
+    Sanitize and extract many raw transcripts, at most `concurrency` extractions in flight, then save
+    every extracted task in a single create_tasks transaction.
+
+    `items` may be an async iterator (e.g. an NDJSON request stream): extraction of early items starts
+    while later ones are still arriving. An item that is an Exception (e.g. a malformed NDJSON line)
+    is reported as that item's error: its message if it is an InvalidBatchItemError, a generic
+    one otherwise.
+    """
+    semaphore = asyncio.Semaphore(concurrency or BATCH_CONCURRENCY)
+
+    async def extract_one(raw: BatchItem) -> List[TaskCreate]:
+        if isinstance(raw, Exception):
+            raise raw
+        with span("sanitize"):
+            transcript = sanitize_transcript(raw)
+        if not transcript:
+            raise InvalidBatchItemError("Transcript is empty.")
+        async with semaphore:
+            with span("extract"):
+                return await extract_transcript_tasks(transcript)
+
+    pending: List[asyncio.Task] = []
+    try:
+        async for raw in _iterate(items):
+            if len(pending) >= BATCH_MAX_ITEMS:
+                raise BatchTooLargeError(f"Batch exceeds {BATCH_MAX_ITEMS} transcripts.")
+            pending.append(asyncio.create_task(extract_one(raw)))
+        outcomes = await asyncio.gather(*pending, return_exceptions=True)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    results: List[TranscriptBatchItemResult] = []
+    extracted: List[TaskCreate] = []
+    # batch item of each task in `extracted`
+    owners: List[int] = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, InvalidBatchItemError):
+            results.append(TranscriptBatchItemResult(index=index, error=str(outcome)))
+        elif isinstance(outcome, BaseException):
+            logging.error("Batch item %d failed during extract_tasks: %r", index, outcome)
+            results.append(TranscriptBatchItemResult(index=index, error="Failed to extract tasks from transcript."))
+        else:
+            results.append(TranscriptBatchItemResult(index=index))
+            extracted.extend(outcome)
+            owners.extend([index] * len(outcome))
+
+    if not extracted:
+        return results
+
+    # --- Persist every item's tasks in one transaction ---
+    try:
+        with span("persist", tasks=len(extracted)):
+            created: List[Tuple[int, TaskRead]] = await create_tasks_indexed(db, extracted)
+    except Exception:
+        logging.exception("Error during create_tasks for batch")
+        for index, outcome in enumerate(outcomes):
+            if not isinstance(outcome, BaseException):
+                results[index].error = "Failed to save tasks to database."
+        return results
+
+    # tasks skipped as duplicate source_ids are simply missing from their item
+    for position, task in created:
+        results[owners[position]].tasks.append(task)
+    return results
@@ -0,0 +1,53 @@
+"""
+app.services.job_service.JobWorkerPool: a worker outlives a job whose run fails (e.g. the database
+goes away while the outcome is recorded) and keeps claiming jobs.
+
+    python -m pytest app/test/test_job_worker.py
+"""
+import os
+import sys
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# app.core.db and ai_service build their engine / client at import without connecting; never used here
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/insight")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from app.services import job_service
+from app.services.job_service import JobWorkerPool
+
+
+def test_worker_survives_a_failing_run(monkeypatch, caplog):
+    queue = [("job-1", "transcript 1", 1), ("job-2", "transcript 2", 1)]
+    ran = []
+
+    async def claim_next_job():
+        return queue.pop(0) if queue else None
+
+    async def run_job(job_id, transcript, attempts):
+        ran.append(job_id)
+        if job_id == "job-1":
+            raise ConnectionError("connection to the database was lost")
+
+    monkeypatch.setattr(job_service, "claim_next_job", claim_next_job)
+    monkeypatch.setattr(job_service, "run_job", run_job)
+
+    async def main():
+        pool = JobWorkerPool(workers=1, poll_interval=0.01)
+        pool.start()
+        for _ in range(100):
+            if len(ran) == 2:
+                break
+            await asyncio.sleep(0.01)
+        worker = pool._tasks[0]
+        assert not worker.done()
+        assert pool._running == {}
+        await pool.stop()
+
+    asyncio.run(main())
+    assert ran == ["job-1", "job-2"]
+    assert "Job worker 0 failed to run job job-1" in caplog.text
@@ -0,0 +1,67 @@
+"""
+app.utils.json_salvage: model output that is malformed or cut off by max_tokens must still yield
+every complete task, and only output with nothing recoverable may raise (and so be retried).
+
+    python -m pytest app/test/test_json_salvage.py
+"""
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.utils.json_salvage import salvage_json
+from app.utils.json_stream import JSONArrayStream
+
+A, B = {"text": "Fix login", "priority": "high", "tags": ["bug"]}, {"text": "Write docs", "tags": []}
+
+SALVAGEABLE = [
+    # (model output, expected value, expected repairs)
+    (json.dumps([A, B]), [A, B], []),
+    ("Here are the tasks:\n" + json.dumps([A]), [A], []),
+    ("```json\n" + json.dumps([A]) + "\n```", [A], ["fence"]),
+    ('[{"text": "Fix login", "priority": "high", "tags": ["bug",],},]', [A], ["trailing_comma"]),
+    ("[{'text': 'Fix login', 'priority': 'high', 'tags': ['bug']}]", [A], ["single_quotes"]),
+    ("[{'text': 'Bob\\'s \"fix\"'}]", [{"text": "Bob's \"fix\""}], ["single_quotes"]),
+    (json.dumps([A]) + "\nLet me know if you need anything else [or more].", [A], ["trailing_prose"]),
+    (json.dumps([A, B])[:-1] + ', {"text": "Deploy', [A, B], ["truncated"]),
+    (json.dumps([A, B])[:-1] + ', {"text": "Deploy", "tags": ["rel', [A, B], ["truncated"]),
+    (json.dumps({"tasks": [A, B]})[:-2] + ', {"te', {"tasks": [A, B]}, ["truncated"]),
+    ('{"tasks": ' + json.dumps([A]) + ', "notes": "unfini', {"tasks": [A]}, ["truncated"]),
+    ("```json\n[{'text': 'Fix login', 'priority': 'high', 'tags': ['bug'],}, {'text': 'Dep",
+     [A], ["fence", "single_quotes", "trailing_comma", "truncated"]),
+    ('[{"text": "Fix login", "priority": "high", "tags": ["bug"]}, {"text": nope}, ' + json.dumps(B) + "]",
+     [A, B], ["dropped_elements"]),
+    ("[]", [], []),
+]
+
+
+@pytest.mark.parametrize("text,value,repairs", SALVAGEABLE)
+def test_salvages(text, value, repairs):
+    result = salvage_json(text)
+    assert result.value == value
+    assert result.repairs == repairs
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "I could not find any tasks in this transcript.",
+    '[{"text": "Fix login", "tags": ["bu',
+    "```json\n[",
+])
+def test_nothing_recoverable_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        salvage_json(text)
+
+
+def test_stream_repairs_elements():
+    parser = JSONArrayStream(repair=lambda element: salvage_json(element).value)
+    text = "[{'text': 'Fix login', 'priority': 'high', 'tags': ['bug'],}, " + json.dumps(B) + "]"
+    completed = []
+    for i in range(0, len(text), 7):
+        completed += parser.feed(text[i:i + 7])
+    assert completed == [A, B]
+    assert parser.repaired == 1
+    assert parser.done
@@ -0,0 +1,130 @@
+"""
+app.utils.prefilter: small talk, attendee lists and repeats are dropped, actionable lines survive,
+and the token budget shrinks a transcript without ever emptying it.
+
+    python -m pytest app/test/test_prefilter.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.utils.prefilter import GAP_MARKER, PrefilterConfig, prefilter_transcript
+
+ON = PrefilterConfig(enabled=True)
+
+MEETING = "\n".join([
+    "Attendees: Elena, Marco, Ana",
+    "Elena: Hi everyone",
+    "Marco: Morning!",
+    "Elena: The checkout page times out for some users on mobile.",
+    "Marco: We need to fix the payment gateway retry logic before Friday.",
+    "Ana: Thanks",
+    "Ana: The dashboard numbers looked fine last week, nothing odd there.",
+    "Action item: Ana to update the release notes",
+])
+
+
+def _lines(text):
+    return text.split("\n")
+
+
+def test_disabled_is_a_no_op():
+    result = prefilter_transcript(MEETING, PrefilterConfig())
+    assert result.text == MEETING
+    assert result.tokens_saved == 0
+
+
+def test_drops_small_talk_and_attendees():
+    result = prefilter_transcript(MEETING, ON)
+    assert _lines(result.text) == [
+        "Elena: The checkout page times out for some users on mobile.",
+        "Marco: We need to fix the payment gateway retry logic before Friday.",
+        GAP_MARKER,
+        "Ana: The dashboard numbers looked fine last week, nothing odd there.",
+        "Action item: Ana to update the release notes",
+    ]
+    assert result.lines_dropped == 4
+    assert result.duplicates_dropped == 0
+
+
+def test_gap_markers_can_be_turned_off():
+    result = prefilter_transcript(MEETING, PrefilterConfig(enabled=True, mark_gaps=False))
+    assert GAP_MARKER not in result.text
+    assert len(_lines(result.text)) == 4
+
+
+@pytest.mark.parametrize("transcript,kept", [
+    # same speaker, same words: an exact repeat, whitespace and case aside
+    ("Marco: We need to fix the retry logic.\nmarco:  we need to fix the retry logic.",
+     ["Marco: We need to fix the retry logic."]),
+    # the same words from someone else are not a repeat
+    ("Marco: We need to fix the retry logic.\nElena: We need to fix the retry logic.",
+     ["Marco: We need to fix the retry logic.", "Elena: We need to fix the retry logic."]),
+    # actionable lines differing by one word (the deadline) are both kept
+    ("Elena: We need to fix the payment gateway retry logic by Monday.\n"
+     "Elena: We need to fix the payment gateway retry logic by Friday.",
+     ["Elena: We need to fix the payment gateway retry logic by Monday.",
+      "Elena: We need to fix the payment gateway retry logic by Friday."]),
+    # discussion lines that say nearly the same thing are collapsed
+    ("Ana: so the dashboard is slow for the team on most days lately\n"
+     "Ana: the dashboard is slow for the team on most days lately",
+     ["Ana: so the dashboard is slow for the team on most days lately"]),
+])
+def test_duplicates(transcript, kept):
+    result = prefilter_transcript(transcript, ON)
+    assert [line for line in _lines(result.text) if line != GAP_MARKER] == kept
+    assert result.duplicates_dropped == len(_lines(transcript)) - len(kept)
+
+
+def test_budget_drops_lowest_scoring_lines_first():
+    filler = [f"Ana: The dashboard numbers for region {i} looked about the same as usual." for i in range(30)]
+    actions = [
+        "Marco: We need to fix the payment gateway retry logic before Friday.",
+        "Action item: Ana to update the release notes",
+    ]
+    transcript = "\n".join(filler[:15] + actions + filler[15:])
+    result = prefilter_transcript(transcript, PrefilterConfig(enabled=True, token_budget=100))
+    assert result.tokens_after <= 100
+    assert result.tokens_after < result.tokens_before
+    for line in actions:
+        assert line in _lines(result.text)
+    assert not result.truncated
+
+
+def test_budget_without_room_for_gap_markers_drops_them():
+    # two short lines far apart: together they fit, but not with a marker between them
+    transcript = "\n".join(
+        ["Marco: Please review PR 12."]
+        + [f"Ana: Region {i} numbers looked about the same as usual." for i in range(20)]
+        + ["Elena: Please deploy it now"]
+    )
+    result = prefilter_transcript(transcript, PrefilterConfig(enabled=True, token_budget=14))
+    assert result.text == "Marco: Please review PR 12.\nElena: Please deploy it now"
+    assert result.tokens_after <= 14
+
+
+def test_budget_splits_a_long_line_into_sentences():
+    sentences = [f"We need to fix the payment gateway retry number {i} before Friday." for i in range(30)]
+    transcript = "Elena: " + " ".join(sentences)
+    result = prefilter_transcript(transcript, PrefilterConfig(enabled=True, token_budget=200))
+    assert result.text
+    assert 0 < result.tokens_after <= 200
+    assert _lines(result.text)[0] == "Elena: " + sentences[0]
+    assert not result.truncated
+
+
+def test_budget_truncates_rather_than_empties():
+    transcript = "Elena: we need to fix the payment gateway " + "and the retry queue " * 100
+    result = prefilter_transcript(transcript, PrefilterConfig(enabled=True, token_budget=50))
+    assert result.truncated
+    assert result.text.startswith("Elena: we need to fix the payment gateway")
+    assert 0 < result.tokens_after <= 50
+
+
+def test_only_small_talk_is_empty():
+    result = prefilter_transcript("Elena: Hi everyone\nMarco: Thanks\nAttendees: Elena, Marco", ON)
+    assert result.text == ""
+    assert not result.truncated
@@ -0,0 +1,202 @@
+"""
+app.utils.ratelimit on a fake clock: the circuit breaker's closed -> open -> half-open transitions,
+and the rate limiter's waiting, max_wait refusal, settle refunds and pauses.
+
+    python -m pytest app/test/test_ratelimit.py
+"""
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.utils.ratelimit import CircuitBreaker, CircuitOpenError, RateLimiter, RateLimitTimeout
+
+
+class FakeClock:
+    """
+    `clock` / `sleep` for the limiter and the breaker: sleeping advances the clock instead of
+    waiting. Tests use rates that are exact in binary (10/s, 1/s) so refills never leave a
+    remainder too small to move the clock.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    async def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+        await asyncio.sleep(0)
+
+    def breaker(self):
+        return CircuitBreaker(failure_ratio=0.5, min_calls=4, window=60, reset_timeout=30, clock=self.monotonic)
+
+    def limiter(self, **limits):
+        return RateLimiter(**limits, clock=self.monotonic, sleep=self.sleep)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _open_breaker(clock):
+    breaker = clock.breaker()
+    for ok in (True, True, False, False):
+        breaker.before_call()
+        breaker.record_success() if ok else breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_breaker_needs_min_calls(clock):
+    breaker = clock.breaker()
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_forgets_outcomes_outside_the_window(clock):
+    breaker = clock.breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(61)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_opens_then_probes_then_closes(clock):
+    breaker = _open_breaker(clock)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.advance(29.9)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.advance(0.1)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # one probe at a time
+    with pytest.raises(CircuitOpenError, match="probe in flight"):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_for_a_full_timeout(clock):
+    breaker = _open_breaker(clock)
+    clock.advance(30)
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.advance(29)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    clock.advance(1)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_retry_in_counts_down_while_open(clock):
+    breaker = _open_breaker(clock)
+    clock.advance(12)
+    assert breaker.retry_in() == pytest.approx(18)
+    clock.advance(18)
+    breaker.before_call()
+    assert breaker.retry_in() == 0
+
+
+def test_released_probe_lets_the_next_one_through(clock):
+    breaker = _open_breaker(clock)
+    clock.advance(30)
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_failures_while_open_do_not_push_the_reset_out(clock):
+    breaker = _open_breaker(clock)
+    # calls admitted before the circuit opened keep failing in
+    for _ in range(5):
+        clock.advance(5)
+        breaker.record_failure()
+    clock.advance(5)
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_limiter_disabled_never_waits(clock):
+    limiter = clock.limiter()
+    assert asyncio.run(limiter.acquire(10 ** 6)) == 0.0
+    assert clock.slept == 0
+
+
+def test_limiter_waits_for_tokens(clock):
+    # 600 tokens/min = 10/s
+    limiter = clock.limiter(tokens_per_minute=600, max_wait=10)
+    assert asyncio.run(limiter.acquire(600)) == 0.0
+    assert asyncio.run(limiter.acquire(30)) == pytest.approx(3.0)
+
+
+def test_limiter_waits_for_requests(clock):
+    # 60 requests/min = 1/s
+    limiter = clock.limiter(requests_per_minute=60, max_wait=5)
+    for _ in range(60):
+        assert asyncio.run(limiter.acquire(0)) == 0.0
+    assert asyncio.run(limiter.acquire(0)) == pytest.approx(1.0)
+
+
+def test_limiter_refuses_beyond_max_wait(clock):
+    limiter = clock.limiter(tokens_per_minute=600, max_wait=5)
+    asyncio.run(limiter.acquire(600))
+    with pytest.raises(RateLimitTimeout) as refused:
+        asyncio.run(limiter.acquire(60))
+    assert refused.value.wait == pytest.approx(6.0)
+    # refused up front: nothing slept, nothing reserved
+    assert clock.slept == 0
+    assert asyncio.run(limiter.acquire(40)) == pytest.approx(4.0)
+
+
+def test_settle_refunds_and_charges(clock):
+    limiter = clock.limiter(tokens_per_minute=600, max_wait=5)
+    asyncio.run(limiter.acquire(600))
+    limiter.settle(reserved=600, used=100)
+    assert asyncio.run(limiter.acquire(500)) == 0.0
+
+    # usage above the reservation is charged: the bucket goes negative and the next caller waits it off
+    limiter.settle(reserved=0, used=20)
+    assert asyncio.run(limiter.acquire(10)) == pytest.approx(3.0)
+
+
+def test_settle_never_overfills(clock):
+    limiter = clock.limiter(tokens_per_minute=600, max_wait=5)
+    limiter.settle(reserved=600, used=0)
+    asyncio.run(limiter.acquire(600))
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(limiter.acquire(60))
+
+
+def test_pause_holds_every_caller(clock):
+    limiter = clock.limiter(max_wait=30)
+    limiter.pause(10)
+    assert asyncio.run(limiter.acquire(1)) == pytest.approx(10.0)
+    limiter.pause(40)
+    with pytest.raises(RateLimitTimeout):
+        asyncio.run(limiter.acquire(1))
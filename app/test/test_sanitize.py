@@ -0,0 +1,75 @@
+"""
+Golden-corpus check for app.utils.text.sanitize_transcript: the compiled, linear-time rewrite must
+produce exactly what the previous implementation (benchmarks/bench_sanitize.py) produced.
+
+    python -m pytest app/test/test_sanitize.py
+"""
+import os
+import sys
+import time
+import random
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.utils.text import sanitize_transcript
+from benchmarks.bench_sanitize import make_pathological, sanitize_transcript_legacy
+from benchmarks.common import make_transcript
+
+CURATED = [
+    "",
+    "   ",
+    "plain text",
+    "Elena: We need to fix the **payment** gateway before _Friday_.",
+    "## Decisions\n- Ship the hotfix\n* Freeze merges\n+ QA signs off\n",
+    "> quoted\n>> nested\n   > indented quote",
+    "```python\nretry(max_attempts=3)\n```\nafter",
+    "```\nno language\n```",
+    "unclosed ```fence with `inline` code",
+    "snake_case_identifier and another_one_here",
+    "a lone * asterisk and a lone _ underscore",
+    "**bold** __bold__ *it* _it_ ***both***",
+    "**unbalanced bold and *unbalanced italic",
+    "\n\n\n\n- item after blank lines\n\n\n\n",
+    " \n\t\n  \n-item without space\n- item\n",
+    "line\r\nwindows\rmac\n",
+    "control\x00\x01chars\x7fhere\tand\ttabs",
+    "back\\slash \\*escaped\\* markers",
+    "Café naïve é composed",
+    "#hashtag vs # heading\n   ### three-space heading\n    #### four-space",
+    "-5 degrees\n- 5 items\n-\n-\n",
+    "* * *\n---\n+++",
+    "`a` `` `b` ```c``` ````d````",
+    "Dr. Chen (PM): see https://example.com/runbooks/incident_42_notes",
+]
+
+
+def _fuzz(seed: int, n: int = 400) -> str:
+    rng = random.Random(seed)
+    alphabet = ["a", "b", " ", "  ", "\t", "\n", "\n\n\n", "*", "**", "_", "__", "`", "```", "#", "## ",
+                "-", "- ", "+ ", ">", "> ", "\\", "\r\n", "\x00", "é", "é", "Elena: "]
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+GOLDEN = (
+    CURATED
+    + [make_transcript(n, seed=n, markdown=md) for n in (200, 2_000, 20_000) for md in (True, False)]
+    + [make_pathological(5_000)]
+    + [_fuzz(seed) for seed in range(300)]
+)
+
+
+@pytest.mark.parametrize("index", range(len(GOLDEN)))
+def test_matches_legacy_output(index):
+    text = GOLDEN[index]
+    assert sanitize_transcript(text) == sanitize_transcript_legacy(text)
+
+
+def test_blank_line_runs_are_linear():
+    # the legacy implementation needs hours for this (quadratic in the length of the blank-line run)
+    text = "a\n" + "\n" * 1_000_000 + "- b"
+    start = time.perf_counter()
+    # the list-marker pattern has always swallowed the blank lines before an item
+    assert sanitize_transcript(text) == "a\nb"
+    assert time.perf_counter() - start < 2
@@ -0,0 +1,150 @@
+"""
+app.utils.singleflight: concurrent callers with the same key share one execution and its result
+or exception, cancelling one caller leaves the shared call and the others alone, and the key is
+free again once the call is done.
+
+    python -m pytest app/test/test_singleflight.py
+"""
+import gc
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from app.utils.singleflight import SingleFlight
+
+
+class Call:
+    """A coroutine function that counts its runs and finishes when `release` is set."""
+
+    def __init__(self, result="tasks", error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _start(flight, key, fn, n):
+    callers = [asyncio.create_task(flight.do(key, fn)) for _ in range(n)]
+    # let every caller reach the shared task
+    await asyncio.sleep(0)
+    return callers
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flight, call = SingleFlight(), Call()
+        callers = await _start(flight, "k", call, 5)
+        assert len(flight) == 1
+        call.release.set()
+        assert await asyncio.gather(*callers) == ["tasks"] * 5
+        assert call.runs == 1
+        assert (flight.started, flight.coalesced) == (1, 4)
+
+    asyncio.run(main())
+
+
+def test_different_keys_do_not_share():
+    async def main():
+        flight, a, b = SingleFlight(), Call("a"), Call("b")
+        callers = await _start(flight, "a", a, 2) + await _start(flight, "b", b, 2)
+        assert len(flight) == 2
+        a.release.set()
+        b.release.set()
+        assert await asyncio.gather(*callers) == ["a", "a", "b", "b"]
+        assert (a.runs, b.runs) == (1, 1)
+
+    asyncio.run(main())
+
+
+def test_exception_reaches_every_caller():
+    async def main():
+        flight, call = SingleFlight(), Call(error=RuntimeError("model down"))
+        callers = await _start(flight, "k", call, 3)
+        call.release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert [type(r) for r in results] == [RuntimeError] * 3
+        assert all(r is results[0] for r in results)
+        assert call.runs == 1
+
+    asyncio.run(main())
+
+
+def test_cancelling_one_caller_leaves_the_call_and_the_others():
+    async def main():
+        flight, call = SingleFlight(), Call()
+        first, second = await _start(flight, "k", call, 2)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert not call.cancelled
+        assert len(flight) == 1
+
+        call.release.set()
+        assert await second == "tasks"
+        assert call.runs == 1
+
+    asyncio.run(main())
+
+
+def test_call_finishes_even_if_every_caller_is_cancelled():
+    async def main():
+        flight, call = SingleFlight(), Call(error=RuntimeError("nobody is listening"))
+        callers = await _start(flight, "k", call, 2)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert len(flight) == 1
+        shared = flight._inflight["k"]
+
+        call.release.set()
+        await asyncio.wait([shared])
+        await asyncio.sleep(0)
+        assert not call.cancelled
+        assert len(flight) == 0
+        # collect the task now: an exception nobody retrieved would be reported to the loop
+        del shared
+        gc.collect()
+
+    loop_errors = []
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda _, context: loop_errors.append(context))
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert loop_errors == []
+
+
+@pytest.mark.parametrize("error", [None, RuntimeError("model down")])
+def test_key_is_cleared_afterwards(error):
+    async def main():
+        flight, first = SingleFlight(), Call(error=error)
+        callers = await _start(flight, "k", first, 2)
+        first.release.set()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert len(flight) == 0
+
+        # a later caller starts a fresh call instead of getting the old outcome
+        second = Call("fresh")
+        second.release.set()
+        assert await flight.do("k", second) == "fresh"
+        assert (first.runs, second.runs) == (1, 1)
+        assert flight.started == 2
+
+    asyncio.run(main())
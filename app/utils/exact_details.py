@@ -1,27 +1,98 @@
+# app/utils/exact_details.py
 import re
-from datetime import datetime
-
-def extract_tasks(transcript: str):
-    tasks = []
-    lines = [l.strip() for l in transcript.splitlines() if l.strip()]
-    idc = 1
-    # look for lines like "Name: action..." or sentences with "need", "will", "can you", "please", "assign"
-    for i, line in enumerate(lines):
-        m = re.match(r'^(?P<who>[A-Z][a-z]+):\s*(?P<rest>.+)$', line)
-        if m:
-            who = m.group('who')
-            rest = m.group('rest')
-            # heuristics for "action-looking" sentences
-            if re.search(r'\b(need|need to|must|please|will|will need|can you|assign|fix|investigate|provide|send|review|run|allocate)\b', rest, re.I):
-                task = {
-                    "id": idc,
-                    "title": rest.split('.')[0][:80],
-                    "assignee": who,
-                    "priority": None,
-                    "due_date": None,
-                    "description": rest,
-                    "notes": ""
-                }
-                tasks.append(task)
-                idc += 1
-    return tasks
\ No newline at end of file
+from typing import List, Optional
+
+from app.schemas.task import TaskCreate
+
+# "Name: ..." / "Dr. Chen (PM): ..." speaker turns
+SPEAKER_LINE = re.compile(r"^(?P<who>[A-Z][\w.'’-]*(?: [A-Z(][\w.'’()-]*){0,3}):\s*(?P<rest>.+)$")
+# explicit action items: "- [ ] ...", "TODO: ...", "Action item: ..."
+ACTION_ITEM_LINE = re.compile(
+    r"^(?:[-*+]\s+)?(?:\[ \]\s*|(?:action items?|todo|follow[- ]up)\s*[:\-]\s*)(?P<rest>.+)$", re.I
+)
+# sentences that read like an action
+ACTION_PATTERN = re.compile(
+    r"\b(need|need to|must|please|will|will need|can you|could you|assign|fix|investigate|provide|send|"
+    r"review|run|allocate|schedule|update|ship|deploy|follow up|own|ping|write|prepare|check)\b",
+    re.I,
+)
+HIGH_PRIORITY = re.compile(
+    r"\b(urgent|asap|critical|blocker|blocking|immediately|today|tonight|hotfix|"
+    r"before (?:monday|tuesday|wednesday|thursday|friday|eod|end of day))\b",
+    re.I,
+)
+LOW_PRIORITY = re.compile(r"\b(when you get a chance|eventually|nice to have|low priority|someday|no rush)\b", re.I)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_TAGS = [
+    (re.compile(r"\b(payments?|billing|checkout)\b", re.I), "payments"),
+    (re.compile(r"\b(deploy\w*|release|staging|rollout)\b", re.I), "release"),
+    (re.compile(r"\b(tests?|qa|regression)\b", re.I), "qa"),
+    (re.compile(r"\b(security|auth\w*|token)\b", re.I), "security"),
+    (re.compile(r"\b(docs?|documentation|runbooks?)\b", re.I), "docs"),
+    (re.compile(r"\b(bug|crash\w*|broken|fails?|failed)\b", re.I), "bug"),
+    (re.compile(r"\b(design|ux|ui)\b", re.I), "design"),
+]
+
+
+def _priority(sentence: str) -> str:
+    if HIGH_PRIORITY.search(sentence):
+        return "high"
+    if LOW_PRIORITY.search(sentence):
+        return "low"
+    return "medium"
+
+
+def _task(sentence: str, owner: Optional[str]) -> TaskCreate:
+    tags = [tag for pattern, tag in _TAGS if pattern.search(sentence)]
+    if owner:
+        tags.append(f"owner:{owner.lower()}")
+    return TaskCreate(text=sentence, priority=_priority(sentence), tags=tags)
+
+
+def structure_score(transcript: str) -> float:
+    """
+    Fraction of non-empty lines that are explicit action items (0.0 - 1.0). Meeting notes that are
+    mostly "- [ ] ..." / "TODO: ..." lines score high; ordinary speaker turns do not count.
+    """
+    total = matched = 0
+    for line in transcript.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        total += 1
+        if ACTION_ITEM_LINE.match(line):
+            matched += 1
+    return matched / total if total else 0.0
+
+
+def extract_tasks(transcript: str) -> List[TaskCreate]:
+    """
+    Regex-based task extraction, no model call: every action-looking sentence of a speaker turn
+    ("Name: we need to ...") and every explicit action item line becomes a task, owned by the
+    speaker. Priority comes from urgency words, tags from a small keyword table.
+    """
+    tasks: List[TaskCreate] = []
+    seen = set()
+    for line in transcript.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        item = ACTION_ITEM_LINE.match(line)
+        if item:
+            owner, sentences = None, [item.group("rest")]
+        else:
+            m = SPEAKER_LINE.match(line)
+            if not m:
+                continue
+            owner = m.group("who")
+            sentences = [s for s in _SENTENCE_END.split(m.group("rest")) if ACTION_PATTERN.search(s)]
+
+        for sentence in sentences:
+            sentence = sentence.strip()
+            key = sentence.lower().rstrip(".!? ")
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            tasks.append(_task(sentence, owner))
+    return tasks
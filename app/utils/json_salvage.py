@@ -0,0 +1,142 @@
+# app/utils/json_salvage.py
+import re
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from app.utils.json_stream import JSONArrayStream
+
+# opening fence (optionally with a language) up to the closing fence, or the end if it was cut off
+_FENCE = re.compile(r"```[\w+-]*[ \t]*\n?(.*?)(?:```|\Z)", re.S)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+@dataclass
+class Salvage:
+    value: Any
+    # what had to be fixed: "fence", "single_quotes", "trailing_comma", "trailing_prose",
+    # "truncated" (incomplete trailing elements dropped), "dropped_elements" (unparseable ones dropped)
+    repairs: List[str] = field(default_factory=list)
+
+
+def _first_bracket(text: str) -> int:
+    return min((i for i in (text.find("["), text.find("{")) if i != -1), default=-1)
+
+
+def _read_string(text: str, start: int) -> Tuple[int, Optional[str]]:
+    """
+    Read the string literal opening at `start` ('...' or "..."); returns the index after it and
+    the literal as a double-quoted JSON string, or None if the text ends inside it.
+    """
+    quote = text[start]
+    buf: List[str] = []
+    i = start + 1
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            buf.append("'" if quote == "'" and nxt == "'" else ch + nxt)
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1, '"' + "".join(buf) + '"'
+        buf.append('\\"' if ch == '"' else ch)
+        i += 1
+    return i, None
+
+
+def _repair(text: str) -> Tuple[str, List[str]]:
+    """
+    Rewrite `text` (starting at its first bracket) into valid JSON: single-quoted strings become
+    double-quoted, trailing commas go, anything after the outermost closing bracket is ignored,
+    and a value cut off mid-way is closed after its last complete array element.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    repairs: List[str] = []
+    # (len(out), open brackets) after the last element that can end the document cleanly
+    cut: Optional[Tuple[int, List[str]]] = None
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in "\"'":
+            i, literal = _read_string(text, i)
+            if literal is None:
+                break
+            if ch == "'" and "single_quotes" not in repairs:
+                repairs.append("single_quotes")
+            out.append(literal)
+            continue
+        i += 1
+        if ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+        elif ch in "}]":
+            if not stack:
+                i -= 1
+                break
+            k = len(out) - 1
+            while k >= 0 and out[k].isspace():
+                k -= 1
+            if k >= 0 and out[k] == ",":
+                del out[k]
+                if "trailing_comma" not in repairs:
+                    repairs.append("trailing_comma")
+            out.append(_CLOSERS[stack.pop()])
+            if not stack:
+                break
+            # an element of an array (a whole task), or a complete top-level member like "tasks": [...]
+            if stack[-1] == "[" or len(stack) == 1:
+                cut = (len(out), list(stack))
+        else:
+            out.append(ch)
+
+    if stack:
+        if cut is None:
+            raise json.JSONDecodeError("JSON cut off before its first complete element", text, len(text))
+        length, still_open = cut
+        out = out[:length] + [_CLOSERS[b] for b in reversed(still_open)]
+        repairs.append("truncated")
+    elif text[i:].strip():
+        repairs.append("trailing_prose")
+    return "".join(out), repairs
+
+
+def salvage_json(text: str) -> Salvage:
+    """
+    Parse model output that should be a JSON array / object, recovering what can be recovered:
+    prose before the first bracket or after the last one, a markdown code fence, single quotes,
+    trailing commas, output cut off mid-element (complete elements are kept), and, as a last
+    resort, elements that still fail to parse (dropped one by one).
+
+    Raises json.JSONDecodeError when nothing usable is left.
+    """
+    text = text.strip()
+    start = _first_bracket(text)
+    try:
+        return Salvage(json.loads(text[max(start, 0):]))
+    except json.JSONDecodeError as e:
+        error = e
+
+    repairs: List[str] = []
+    fence = text.find("```")
+    if fence != -1 and (start == -1 or fence < start):
+        m = _FENCE.search(text, fence)
+        text = m.group(1).strip()
+        start = _first_bracket(text)
+        repairs.append("fence")
+    if start == -1:
+        raise error
+
+    repaired, kinds = _repair(text[start:])
+    repairs.extend(kinds)
+    try:
+        value = json.loads(repaired, strict=False)
+    except json.JSONDecodeError:
+        if not repaired.startswith("["):
+            raise error
+        value = JSONArrayStream().feed(repaired)
+        if not value:
+            raise error
+        repairs.append("dropped_elements")
+    return Salvage(value, repairs)
@@ -0,0 +1,83 @@
+# app/utils/json_stream.py
+import json
+import logging
+from typing import Any, Callable, List, Optional
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a JSON array that arrives in arbitrary text fragments (e.g. LLM tokens).
+
+    `feed()` returns the object/array elements completed by that fragment, so callers can act on
+    each element as soon as its closing bracket arrives. Anything before the first '[' (stray prose)
+    is skipped, scalar elements are ignored, and an element that fails to parse is handed to `repair`
+    (e.g. json_salvage.salvage_json) if given, otherwise (or if that fails too) logged and dropped.
+    """
+
+    def __init__(self, repair: Optional[Callable[[str], Any]] = None):
+        self.started = False
+        self.done = False
+        self.repair = repair
+        # elements `repair` recovered
+        self.repaired = 0
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        completed: List[Any] = []
+        for ch in text:
+            if self.done:
+                break
+            if not self.started:
+                if ch == "[":
+                    self.started = True
+                continue
+
+            if self._in_string:
+                if self._depth:
+                    self._buf.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth:
+                    self._buf.append(ch)
+                continue
+
+            if self._depth == 0:
+                # between elements of the top-level array
+                if ch in "{[":
+                    self._depth = 1
+                    self._buf = [ch]
+                elif ch == "]":
+                    self.done = True
+                continue
+
+            self._buf.append(ch)
+            if ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    element = "".join(self._buf)
+                    self._buf = []
+                    try:
+                        completed.append(json.loads(element))
+                    except json.JSONDecodeError:
+                        if self.repair is not None:
+                            try:
+                                completed.append(self.repair(element))
+                                self.repaired += 1
+                                continue
+                            except json.JSONDecodeError:
+                                pass
+                        logging.warning("Dropping unparseable streamed element: %r", element[:200])
+        return completed
@@ -0,0 +1,138 @@
+# app/utils/openai_cassette.py
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import importlib
+from typing import Any, Dict, Optional
+
+from openai import DefaultAsyncHttpxClient
+
+# The HTTP library the installed OpenAI SDK is built on (httpx, or httpx2 in newer releases):
+# the transport, its inner transport and the responses must all come from that one.
+httpx = importlib.import_module(DefaultAsyncHttpxClient.__mro__[1].__module__.partition(".")[0])
+
+MODES = ("off", "record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """Replay mode found no recording for a request."""
+
+
+def _body(request: httpx.Request) -> Any:
+    try:
+        return json.loads(request.content or b"null")
+    except ValueError:
+        return request.content.decode("utf-8", "replace")
+
+
+def request_key(request: httpx.Request) -> str:
+    """
+    Hash of method, path and the canonical JSON body (model, messages, sampling params, stream
+    flag...), so the same prompt sent the same way maps to the same recording.
+    """
+    canonical = json.dumps(
+        {"method": request.method, "path": request.url.path, "body": _body(request)},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport for the OpenAI client that records request -> response pairs to disk and
+    replays them, one JSON file per request key in `directory`.
+
+    Modes: "record" always calls the API and (over)writes the recording; "replay" serves only
+    recordings and raises CassetteMiss otherwise; "auto" replays when a recording exists and
+    records when it does not. Streamed responses are stored whole and replayed as one body,
+    which the SDK parses exactly like the live event stream.
+
+    `latency_ms` delays each replayed response: a number of milliseconds, or "recorded" to
+    wait as long as the original call took. None replays immediately.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        directory: str,
+        latency_ms: Optional[str] = None,
+        inner: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unsupported cassette mode {mode!r}; expected one of record, replay, auto")
+        self.mode = mode
+        self.directory = directory
+        self.latency_ms = latency_ms
+        self._inner = inner or httpx.AsyncHTTPTransport()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = request_key(request)
+        path = self._path(key)
+
+        if self.mode in ("replay", "auto") and os.path.exists(path):
+            return await self._replay(request, path)
+        if self.mode == "replay":
+            raise CassetteMiss(f"No recording for {request.method} {request.url.path} (key {key[:12]}) in {self.directory}")
+        return await self._record(request, path)
+
+    async def _replay(self, request: httpx.Request, path: str) -> httpx.Response:
+        with open(path, encoding="utf-8") as f:
+            entry: Dict[str, Any] = json.load(f)
+        delay = self._replay_delay(entry)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"].encode("utf-8"),
+            request=request,
+        )
+
+    def _replay_delay(self, entry: Dict[str, Any]) -> float:
+        if not self.latency_ms:
+            return 0.0
+        if self.latency_ms == "recorded":
+            return entry.get("elapsed_ms", 0) / 1000
+        return float(self.latency_ms) / 1000
+
+    async def _record(self, request: httpx.Request, path: str) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        # content-encoding is dropped: `body` is already decoded
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() in ("content-type", "retry-after", "x-request-id")
+        }
+        # errors (429s, 5xx) are served but never recorded, so a replay cannot get stuck on one
+        if response.is_success:
+            entry = {
+                "request": _body(request),
+                "status": response.status_code,
+                "headers": headers,
+                "body": body.decode("utf-8"),
+                "elapsed_ms": elapsed_ms,
+            }
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, path)
+        else:
+            logging.warning("Not recording %s response for %s", response.status_code, request.url.path)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
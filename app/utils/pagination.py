@@ -0,0 +1,22 @@
+# app/utils/pagination.py
+import json
+import base64
+from typing import Any, Dict
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """Opaque, URL-safe cursor for keyset pagination."""
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(data, dict):
+        raise ValueError("Invalid cursor")
+    return data
@@ -0,0 +1,217 @@
+# app/utils/prefilter.py
+import re
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+from app.utils.exact_details import ACTION_ITEM_LINE, ACTION_PATTERN, HIGH_PRIORITY, SPEAKER_LINE
+
+# metadata lines that never carry a task
+_ATTENDEES = re.compile(r"^(?:attendees|participants|present|invitees|cc)\s*:", re.I)
+# greetings / acknowledgements, only when the whole turn is short and contains no action
+_SMALL_TALK = re.compile(
+    r"^(?:hi|hello|hey|morning|good (?:morning|afternoon|evening)|thanks?|thank you|cheers|bye|see you|"
+    r"ok(?:ay)?|yeah|yep|yes|no|sure|great|cool|nice|awesome|perfect|sounds good|got it|makes sense|"
+    r"right|agreed|copy that|can you hear me|you'?re on mute|sorry)\b[\s\w,'’!.-]{0,40}$",
+    re.I,
+)
+_DEADLINE = re.compile(
+    r"\b(?:by|before|until|due)\s+(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"tomorrow|today|tonight|eod|end of|next week|\d)",
+    re.I,
+)
+_WORDS = re.compile(r"[a-z0-9]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+GAP_MARKER = "[...]"
+# lines scoring at least this are actionable; they are dropped for the budget only as a last resort
+ACTIONABLE_SCORE = 2.0
+# near-duplicates are looked for among this many previously kept lines
+_NEAR_DUPLICATE_WINDOW = 50
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token, close enough to budget prompt size."""
+    return len(text) // 4
+
+
+@dataclass(frozen=True)
+class PrefilterConfig:
+    enabled: bool = False
+    # estimated tokens the filtered transcript may use; 0 = only drop low-value lines and duplicates
+    token_budget: int = 0
+    # word-set Jaccard similarity at which a non-actionable line counts as a repeat of an earlier one
+    near_duplicate_threshold: float = 0.9
+    # replace each run of dropped lines with GAP_MARKER so the model sees that something was cut
+    mark_gaps: bool = True
+
+    def cache_tag(self) -> str:
+        """Part of the extraction cache key: different filtering => different prompt => different tasks."""
+        if not self.enabled:
+            return ""
+        spec = f"{self.token_budget}:{self.near_duplicate_threshold}:{int(self.mark_gaps)}"
+        return "+pf" + hashlib.sha256(spec.encode()).hexdigest()[:8]
+
+
+@dataclass
+class PrefilterResult:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    lines_dropped: int = 0
+    duplicates_dropped: int = 0
+    # the most actionable line alone was over the budget and had to be cut short
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def score_line(line: str) -> float:
+    """
+    Actionability of one line: 0 for attendee lists and small talk, 1 for ordinary discussion,
+    more for questions, action sentences (exact_details.ACTION_PATTERN), urgency and deadlines,
+    and explicit action items.
+    """
+    if ACTION_ITEM_LINE.match(line):
+        return 3.0
+    if _ATTENDEES.match(line):
+        return 0.0
+    m = SPEAKER_LINE.match(line)
+    content = m.group("rest") if m else line
+    if not ACTION_PATTERN.search(content):
+        if _SMALL_TALK.match(content.strip()):
+            return 0.0
+        return 1.2 if "?" in content else 1.0
+    score = ACTIONABLE_SCORE
+    if HIGH_PRIORITY.search(content) or _DEADLINE.search(content):
+        score += 1.0
+    return score
+
+
+def _words(line: str) -> Set[str]:
+    m = SPEAKER_LINE.match(line)
+    return set(_WORDS.findall((m.group("rest") if m else line).lower()))
+
+
+def _split_long_line(line: str, max_chars: int) -> List[str]:
+    """
+    A line longer than `max_chars` as one line per sentence, each keeping the speaker
+    ("Elena: ..."), so the budget can drop parts of a long turn instead of all of it.
+    """
+    if len(line) <= max_chars:
+        return [line]
+    m = SPEAKER_LINE.match(line)
+    prefix, body = (m.group("who") + ": ", m.group("rest")) if m else ("", line)
+    sentences = [s.strip() for s in _SENTENCE_END.split(body) if s.strip()]
+    if len(sentences) <= 1:
+        return [line]
+    return [prefix + s for s in sentences]
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    """`text` cut to at most `max_chars`, at a word boundary when there is one."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    return cut[:space] if space > 0 else cut
+
+
+def _is_repeat(words: Set[str], recent: List[Set[str]], threshold: float) -> bool:
+    if len(words) < 4:
+        return False
+    for other in recent:
+        if other and len(words & other) / len(words | other) >= threshold:
+            return True
+    return False
+
+
+def prefilter_transcript(transcript: str, config: PrefilterConfig) -> PrefilterResult:
+    """
+    Shrink a sanitized transcript before it goes into the prompt:
+
+    - drop attendee lists, small talk, exact repeats (same speaker, same words in the same order)
+      and near-duplicates of discussion lines; an actionable line is only ever dropped as an exact
+      repeat, since "by Monday" and "by Friday" differ by one word
+    - lift the line just before an actionable one (its question or context) to at least neutral
+    - if the rest is still over `config.token_budget`, drop the lowest-scoring lines
+      (latest first among equals) until it fits; lines longer than the budget allows are first
+      split into sentences, and the highest-scoring line is never dropped: if it alone is over
+      the budget it is truncated (`truncated=True`) so the model still sees the start of it
+    """
+    tokens_before = estimate_tokens(transcript)
+    if not config.enabled or not transcript:
+        return PrefilterResult(transcript, tokens_before, tokens_before)
+
+    budget_chars = config.token_budget * 4
+    lines = [line.strip() for line in transcript.split("\n")]
+    lines = [line for line in lines if line]
+    if budget_chars:
+        # a line over a quarter of the budget would be all-or-nothing for the budget step
+        lines = [part for line in lines for part in _split_long_line(line, max(budget_chars // 4, 1))]
+    scores = [score_line(line) for line in lines]
+    for i in range(len(lines) - 1):
+        if scores[i + 1] >= ACTIONABLE_SCORE and scores[i] < 1.5:
+            scores[i] = 1.5
+
+    keep = [score > 0 for score in scores]
+    duplicates = 0
+    seen: Set[str] = set()
+    recent: List[Set[str]] = []
+    for i, line in enumerate(lines):
+        if not keep[i]:
+            continue
+        words = _words(line)
+        key = " ".join(line.lower().split())
+        near = scores[i] < ACTIONABLE_SCORE and _is_repeat(words, recent, config.near_duplicate_threshold)
+        if key in seen or near:
+            keep[i] = False
+            duplicates += 1
+            continue
+        seen.add(key)
+        recent.append(words)
+        if len(recent) > _NEAR_DUPLICATE_WINDOW:
+            recent.pop(0)
+
+    truncated = False
+    if budget_chars:
+        # +1 per line for its newline
+        size = sum(len(line) + 1 for line, k in zip(lines, keep) if k)
+        if size > budget_chars:
+            kept = sorted((i for i in range(len(lines)) if keep[i]), key=lambda i: (scores[i], -i))
+            # kept[-1] is the highest-scoring line (earliest among equals): it always stays
+            for i in kept[:-1]:
+                keep[i] = False
+                size -= len(lines[i]) + 1
+                if size <= budget_chars:
+                    break
+            if size > budget_chars:
+                best = kept[-1]
+                lines[best] = _truncate(lines[best], budget_chars)
+                truncated = True
+
+    out: List[str] = []
+    gap: Optional[bool] = None
+    for line, k in zip(lines, keep):
+        if k:
+            if gap and config.mark_gaps:
+                out.append(GAP_MARKER)
+            out.append(line)
+            gap = False
+        elif gap is not None:
+            gap = True
+    text = "\n".join(out)
+    if config.token_budget and estimate_tokens(text) > config.token_budget:
+        # the budget above was reached without counting gap markers
+        text = "\n".join(line for line, k in zip(lines, keep) if k)
+
+    return PrefilterResult(
+        text=text,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(text),
+        lines_dropped=keep.count(False),
+        duplicates_dropped=duplicates,
+        truncated=truncated,
+    )
@@ -0,0 +1,211 @@
+# app/utils/ratelimit.py
+import time
+import random
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional, Tuple
+
+
+class RateLimitTimeout(Exception):
+    """Waiting for capacity would take longer than the limiter's `max_wait`."""
+
+    def __init__(self, message: str, wait: float = 0.0):
+        super().__init__(message)
+        # seconds until the capacity is expected to be there
+        self.wait = wait
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker is rejecting calls."""
+
+
+class TokenBucket:
+    """Continuously refilling bucket: `capacity` units, refilled at `rate` units/second, full at `now`."""
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.level = capacity
+        self._updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` (capped at capacity) is available; 0 when it already is."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(missing, 0.0) / self.rate
+
+    def take(self, amount: float) -> None:
+        # may go negative (usage above the reservation); later callers wait it off
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for an API with requests/min and tokens/min quotas, shared by every caller
+    in the process. `acquire(tokens)` waits (first come, first served) until both buckets have
+    room; `settle` corrects the token bucket once the real usage is known; `pause` stops all
+    callers for a while (e.g. the server's Retry-After on a 429).
+
+    A limit of 0 disables that bucket. `clock` and `sleep` default to time.monotonic and
+    asyncio.sleep (tests pass a fake clock).
+    """
+
+    POLL_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_wait: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.clock = clock
+        self.sleep = sleep
+        now = clock()
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60, now) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60, now) if tokens_per_minute else None
+        self.max_wait = max_wait
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests is not None or self.tokens is not None
+
+    def _wait_time(self, tokens: int) -> float:
+        now = self.clock()
+        wait = max(self._paused_until - now, 0.0)
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    async def acquire(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; returns the seconds spent waiting."""
+        if not self.enabled and self._paused_until <= self.clock():
+            return 0.0
+        start = self.clock()
+        async with self._lock:
+            while True:
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                if self.clock() - start + wait > self.max_wait:
+                    raise RateLimitTimeout(
+                        f"rate limited: capacity in {wait:.1f}s exceeds max wait {self.max_wait:.0f}s", wait
+                    )
+                # re-check in slices: `settle` may refund tokens while we wait
+                await self.sleep(min(wait, self.POLL_INTERVAL))
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+        return self.clock() - start
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Charge (or refund) the difference between the reservation and the actual token usage."""
+        if self.tokens is not None:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + reserved - used)
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Opens when, within the last `window` seconds, at least `min_calls` calls were made and at
+    least `failure_ratio` of them failed. While open, `before_call` raises CircuitOpenError; after
+    `reset_timeout` seconds one probe call is let through (half-open): success closes the
+    circuit, failure opens it again. `clock` defaults to time.monotonic.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(
+        self,
+        failure_ratio: float = 0.5,
+        min_calls: int = 10,
+        window: float = 60.0,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.clock = clock
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            if self.clock() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("circuit open: upstream failing")
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError("circuit half-open: probe in flight")
+            self._probing = True
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through; 0 when it is not open."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.reset_timeout - (self.clock() - self._opened_at), 0.0)
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self._probing = False
+            self._outcomes.clear()
+        self._record(True)
+
+    def record_failure(self) -> None:
+        if self.state == self.OPEN:
+            # a call admitted before the circuit opened; re-opening would keep pushing the reset out
+            return
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self._record(False)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_ratio:
+            self._open()
+
+    def release(self) -> None:
+        """A call ended without a verdict (e.g. cancelled): let another probe through."""
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+
+    def _record(self, ok: bool) -> None:
+        now = self.clock()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = self.clock()
+        self._probing = False
+        self._outcomes.clear()
+
+
+def retry_delay(attempt: int, base: float, cap: float = 30.0, retry_after: Optional[float] = None) -> float:
+    """
+    "Full jitter" backoff: uniform in [0, min(cap, base * 2^(attempt-1))], so retries from a burst
+    spread out instead of arriving together; never sooner than the server's Retry-After.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
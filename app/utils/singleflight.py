@@ -0,0 +1,41 @@
+# app/utils/singleflight.py
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight execution.
+
+    The first caller for a key starts `fn()` as a task; callers arriving while it runs await the
+    same task and receive the same result or exception. Each caller awaits through
+    `asyncio.shield`, so cancelling one caller never cancels the shared work for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # mark the outcome as retrieved even if every caller was cancelled before it finished
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -1,6 +1,22 @@
 # app/utils/text.py
 import re
 import unicodedata
+from typing import List
+
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]+')
+_CODE_FENCE_RE = re.compile(r'```(?:[\w+-]*\n)?(.*?)```', re.S)
+_INLINE_CODE_RE = re.compile(r'`([^`]*)`')
+_STRONG_RE = re.compile(r'(\*\*|__)(.*?)\1', re.S)
+_EMPHASIS_RE = re.compile(r'(\*|_)(.*?)\1', re.S)
+_HEADING_RE = re.compile(r'(?m)^\s{0,3}#{1,6}\s*')
+# "^\s*[-*+]\s+" retried the match at every line start inside a run of blank lines (quadratic);
+# the second branch consumes a run that is not followed by a list marker and puts it back unchanged
+_LIST_MARKER_RE = re.compile(r'(?m)^(?:\s*[-*+]\s+|(\s+))')
+_BLOCKQUOTE_RE = re.compile(r'(?m)^\s{0,3}>\s?')
+# runs of spaces/tabs other than a lone space (replacing every single space with itself is most of the cost)
+_SPACES_RE = re.compile(r'\t[ \t]*| [ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
 
 def sanitize_transcript(transcript: str) -> str:
     """
@@ -18,6 +34,10 @@ def sanitize_transcript(transcript: str) -> str:
     - Collapse multiple spaces/tabs into single space
     - Collapse 3+ newlines into max 2
     - Strip leading/trailing whitespace
+
+    Runs in linear time: every pattern either matches or fails within a bounded distance, except
+    the lazy fence/emphasis scans, which can only fail once per marker (when no closing marker
+    follows). Passes whose marker character does not occur in the text are skipped.
     """
 
     if not transcript:
@@ -27,40 +47,131 @@ def sanitize_transcript(transcript: str) -> str:
     text = unicodedata.normalize("NFC", transcript)
 
     # Normalize line endings
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     # Remove control characters except tab and newline
-    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]+', ' ', text)
+    text = _CONTROL_RE.sub(' ', text)
 
     # --- Markdown-aware cleanup ---
 
-    # Remove code fences but keep the inner content
-    text = re.sub(r'```(?:[\w+-]*\n)?(.*?)```', r'\1', text, flags=re.S)
-
-    # Unwrap inline code: `code` -> code
-    text = re.sub(r'`([^`]*)`', r'\1', text)
+    if "`" in text:
+        # Remove code fences but keep the inner content
+        text = _CODE_FENCE_RE.sub(r'\1', text)
+        # Unwrap inline code: `code` -> code
+        text = _INLINE_CODE_RE.sub(r'\1', text)
 
     # Unwrap bold and italic markers while preserving the inner text
-    text = re.sub(r'(\*\*|__)(.*?)\1', r'\2', text, flags=re.S)
-    text = re.sub(r'(\*|_)(.*?)\1', r'\2', text, flags=re.S)
+    if "*" in text or "_" in text:
+        text = _STRONG_RE.sub(r'\2', text)
+        text = _EMPHASIS_RE.sub(r'\2', text)
 
     # Remove heading markers at start of line: "## Title" -> "Title"
-    text = re.sub(r'(?m)^\s{0,3}#{1,6}\s*', '', text)
+    if "#" in text:
+        text = _HEADING_RE.sub('', text)
 
     # Remove leading list markers at start of line: "- item" or "* item" or "+ item"
-    text = re.sub(r'(?m)^\s*[-*+]\s+', '', text)
+    if "-" in text or "*" in text or "+" in text:
+        text = _LIST_MARKER_RE.sub(r'\1', text)
 
     # Remove blockquote markers at line start: "> quoted" -> "quoted"
-    text = re.sub(r'(?m)^\s{0,3}>\s?', '', text)
+    if ">" in text:
+        text = _BLOCKQUOTE_RE.sub('', text)
 
     # Remove stray backslashes (optional) but do this after handling code
     text = text.replace('\\', '')
 
     # Collapse multiple spaces / tabs into one
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _SPACES_RE.sub(' ', text)
 
     # Collapse many blank lines into max two newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
 
     # Strip leading/trailing whitespace
     return text.strip()
+
+
+# A line that opens a new speaker turn, e.g. "Elena: ..." or "Dr. Smith (PM): ..."
+_SPEAKER_RE = re.compile(r"^[A-Z][\w .'()-]{0,40}:\s")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_long_segment(segment: str, max_chars: int) -> List[str]:
+    """Break a single oversized turn on sentence boundaries, hard-wrapping as a last resort."""
+    parts: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT_RE.split(segment):
+        while len(sentence) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            parts.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunk_transcript(transcript: str, max_chars: int = 6000, overlap_chars: int = 400) -> List[str]:
+    """
+    Split a sanitized transcript into chunks of at most ~`max_chars` for map-reduce extraction.
+
+    - Boundaries fall between paragraphs or speaker turns ("Name: ..."), never inside a turn
+      unless the turn alone exceeds `max_chars` (then it is split on sentences)
+    - Each chunk starts with the trailing turns of the previous chunk, up to `overlap_chars`,
+      so a task discussed across a boundary keeps its context
+    """
+    if not transcript:
+        return []
+    if len(transcript) <= max_chars:
+        return [transcript]
+
+    # --- Collect segments: one per paragraph / speaker turn ---
+    segments: List[str] = []
+    current: List[str] = []
+    for line in transcript.split("\n"):
+        if not line.strip() or _SPEAKER_RE.match(line):
+            if current:
+                segments.append("\n".join(current))
+                current = []
+            if not line.strip():
+                continue
+        current.append(line)
+    if current:
+        segments.append("\n".join(current))
+
+    units: List[str] = []
+    for segment in segments:
+        if len(segment) > max_chars:
+            units.extend(_split_long_segment(segment, max_chars))
+        else:
+            units.append(segment)
+
+    # --- Pack segments into chunks, carrying a tail of the previous chunk as overlap ---
+    chunks: List[str] = []
+    chunk: List[str] = []
+    size = 0
+    fresh = 0  # segments in `chunk` that are not overlap from the previous chunk
+    for unit in units:
+        if fresh and size + len(unit) + 2 > max_chars:
+            chunks.append("\n\n".join(chunk))
+            tail: List[str] = []
+            tail_size = 0
+            for prev in reversed(chunk):
+                if tail_size + len(prev) + 2 > overlap_chars or tail_size + len(prev) + len(unit) + 4 > max_chars:
+                    break
+                tail.insert(0, prev)
+                tail_size += len(prev) + 2
+            chunk, size, fresh = tail, tail_size, 0
+        chunk.append(unit)
+        size += len(unit) + 2
+        fresh += 1
+    if fresh:
+        chunks.append("\n\n".join(chunk))
+
+    return chunks
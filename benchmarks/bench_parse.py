@@ -0,0 +1,88 @@
+"""
+Throughput of the parsing/normalization half of ai_service.extract_tasks (parse_tasks +
+normalize_task) on canned model outputs, so no OpenAI call is made.
+
+    python benchmarks/bench_parse.py --sizes 5 50 500
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ai_service builds its OpenAI client at import time; parsing never uses it
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from benchmarks.common import measure
+from app.services.ai_service import parse_tasks
+
+
+def _tasks(n: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "text": f"Follow up on item {i}: fix the {rng.choice(['login', 'export', 'sync', 'billing'])} bug",
+            "priority": rng.choice(["low", "medium", "high", "HIGH", None]),
+            "tags": rng.sample(["backend", "frontend", "qa", "docs", "infra", "payments"], rng.randint(0, 3)),
+        }
+        for i in range(n)
+    ]
+
+
+# canned model outputs seen in practice; each must parse without raising
+CASES: Dict[str, Callable[[List[dict]], str]] = {
+    "clean": lambda tasks: json.dumps(tasks),
+    "pretty": lambda tasks: json.dumps(tasks, indent=2),
+    "prose_prefix": lambda tasks: "Here are the tasks I found:\n" + json.dumps(tasks),
+    "wrapped": lambda tasks: json.dumps({"tasks": tasks}),
+    "alt_keys": lambda tasks: json.dumps([
+        {"task_id": t["id"], "title": t["text"], "priority": t["priority"], "labels": ", ".join(t["tags"])}
+        for t in tasks
+    ]),
+    # salvaged by app.utils.json_salvage instead of failing (and re-calling the model)
+    "fenced_sloppy": lambda tasks: "```json\n" + json.dumps(tasks).replace("}", ",}").replace("]", ",]") + "\n```",
+    "truncated": lambda tasks: json.dumps(tasks + [{"text": "cut off"}])[:-15],
+}
+
+
+def run(sizes: List[int], repeat: int) -> List[dict]:
+    results = []
+    for n in sizes:
+        tasks = _tasks(n, seed=n)
+        for case, render in CASES.items():
+            content = render(tasks)
+            assert len(parse_tasks(content)) == n, case
+            stats = measure(lambda: parse_tasks(content), repeat)
+            results.append({
+                "benchmark": "parse_tasks",
+                "case": case,
+                "n": n,
+                **stats,
+                "tasks_per_sec": round(n / (stats["median_ms"] / 1000), 1),
+            })
+    return results
+
+
+def main(argv=None) -> List[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<13} {'tasks':>6} {'median ms':>10} {'tasks/s':>10}")
+        for r in results:
+            print(f"{r['case']:<13} {r['n']:>6} {r['median_ms']:>10} {r['tasks_per_sec']:>10}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
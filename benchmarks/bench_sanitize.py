@@ -0,0 +1,101 @@
+"""
+Throughput of app.utils.text.sanitize_transcript over transcript sizes (offline, no services needed),
+optionally against the previous implementation (uncompiled patterns, quadratic on blank-line runs).
+
+    python benchmarks/bench_sanitize.py --sizes 1000 10000 100000 1000000 10000000 --legacy
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import unicodedata
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import make_transcript, measure
+from app.utils.text import sanitize_transcript
+
+# the legacy implementation needs minutes beyond this on the blank-line case
+LEGACY_PATHOLOGICAL_MAX_CHARS = 20_000
+
+
+def sanitize_transcript_legacy(transcript: str) -> str:
+    """The pre-compiled implementation, kept here as the baseline (and the golden reference in tests)."""
+    if not transcript:
+        return ""
+    text = unicodedata.normalize("NFC", transcript)
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]+', ' ', text)
+    text = re.sub(r'```(?:[\w+-]*\n)?(.*?)```', r'\1', text, flags=re.S)
+    text = re.sub(r'`([^`]*)`', r'\1', text)
+    text = re.sub(r'(\*\*|__)(.*?)\1', r'\2', text, flags=re.S)
+    text = re.sub(r'(\*|_)(.*?)\1', r'\2', text, flags=re.S)
+    text = re.sub(r'(?m)^\s{0,3}#{1,6}\s*', '', text)
+    text = re.sub(r'(?m)^\s*[-*+]\s+', '', text)
+    text = re.sub(r'(?m)^\s{0,3}>\s?', '', text)
+    text = text.replace('\\', '')
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+def make_pathological(n_chars: int) -> str:
+    """Long runs of blank and whitespace-only lines, snake_case identifiers and lone markers."""
+    unit = "Elena: check snake_case_name and a lone * here\n" + "\n" * 40 + "  \n\t\n" * 10
+    return (unit * (n_chars // len(unit) + 1))[:n_chars]
+
+
+CASES = {
+    "markdown": lambda n: make_transcript(n, seed=n, markdown=True),
+    "plain": lambda n: make_transcript(n, seed=n, markdown=False),
+    "blank_lines": make_pathological,
+}
+
+
+def run(sizes: List[int], repeat: int, legacy: bool = False) -> List[dict]:
+    impls = [("current", sanitize_transcript)]
+    if legacy:
+        impls.append(("legacy", sanitize_transcript_legacy))
+
+    results = []
+    for n in sizes:
+        for case, make in CASES.items():
+            transcript = make(n)
+            for impl, fn in impls:
+                if impl == "legacy" and case == "blank_lines" and n > LEGACY_PATHOLOGICAL_MAX_CHARS:
+                    continue
+                # big inputs: a couple of calls is plenty
+                stats = measure(lambda: fn(transcript), repeat if n < 1_000_000 else min(repeat, 3))
+                results.append({
+                    "benchmark": "sanitize_transcript",
+                    "case": case,
+                    "impl": impl,
+                    "n": n,
+                    **stats,
+                    "mb_per_sec": round(n / 1e6 / (stats["median_ms"] / 1000), 2),
+                })
+    return results
+
+
+def main(argv=None) -> List[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy", action="store_true", help="also time the previous implementation")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.legacy)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<12} {'impl':<8} {'chars':>9} {'median ms':>10} {'MB/s':>8}")
+        for r in results:
+            print(f"{r['case']:<12} {r['impl']:<8} {r['n']:>9} {r['median_ms']:>10} {r['mb_per_sec']:>8}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
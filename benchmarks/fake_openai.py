@@ -0,0 +1,193 @@
+"""
+Local OpenAI-compatible stand-in for load tests: serves POST /v1/chat/completions (plain and
+`stream=True`) with a configurable latency distribution, error rate and response size, so the
+API can be driven at high concurrency without calling (or paying for) the real service.
+
+    python benchmarks/fake_openai.py --port 8100 --latency-ms 800 --latency-sigma 0.5 --error-rate 0.02 --tasks 5
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=sk-fake uvicorn main:app --workers 4
+
+Latency is log-normal: --latency-ms is the median, --latency-sigma the spread (0 = constant;
+0.5 puts p99 at ~3.2x the median). Failed calls answer --error-status (500 or 429) with an
+OpenAI-style error body; a 429 carries Retry-After: 1. The client runs with the SDK's retries off
+(OPENAI_SDK_MAX_RETRIES=0): app.services.ai_service retries both with jittered backoff, honours
+Retry-After, and counts them towards its circuit breaker. Responses are derived from the prompt,
+so the same transcript always yields the same tasks. GET /stats returns request/error counters.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_PRIORITIES = ["low", "medium", "high"]
+_TAGS = ["backend", "frontend", "qa", "payments", "infra", "docs", "security", "design"]
+_VERBS = ["Fix", "Review", "Update", "Schedule", "Investigate", "Document", "Deploy", "Refactor"]
+_OBJECTS = [
+    "the payment gateway race condition", "the staging deploy pipeline", "the onboarding docs",
+    "token refresh handling", "the regression suite", "dashboard empty states", "p99 latency spikes",
+    "the export button", "sync conflict resolution", "the incident runbook",
+]
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 500.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    tasks: int = 5
+    # streamed responses: fraction of the latency spent before the first chunk
+    first_chunk_share: float = 0.3
+    stream_chunk_chars: int = 24
+
+
+def _latency(config: FakeConfig, rng: random.Random) -> float:
+    """Seconds to spend on one call."""
+    median = config.latency_ms / 1000
+    if config.latency_sigma <= 0:
+        return median
+    return rng.lognormvariate(0, config.latency_sigma) * median
+
+
+def _content(prompt: str, n_tasks: int) -> str:
+    """A JSON array of `n_tasks` task objects, deterministic in `prompt`."""
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    tasks = [
+        {
+            "id": str(i + 1),
+            "text": f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} ({rng.getrandbits(32):08x})",
+            "priority": rng.choice(_PRIORITIES),
+            "tags": rng.sample(_TAGS, rng.randint(1, 3)),
+        }
+        for i in range(n_tasks)
+    ]
+    return json.dumps(tasks)
+
+
+def _usage(prompt: str, content: str) -> Dict[str, int]:
+    # ~4 characters per token is close enough for capacity numbers
+    prompt_tokens, completion_tokens = len(prompt) // 4, len(content) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(config: FakeConfig, seed: int = 0) -> FastAPI:
+    app = FastAPI(title="fake-openai")
+    rng = random.Random(seed)
+    stats = {"requests": 0, "streamed": 0, "errors": 0}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body: Dict[str, Any] = await request.json()
+        stats["requests"] += 1
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        model = body.get("model", "fake")
+        created = int(time.time())
+        completion_id = f"chatcmpl-fake{stats['requests']}"
+        delay = _latency(config, rng)
+
+        if rng.random() < config.error_rate:
+            stats["errors"] += 1
+            await asyncio.sleep(delay)
+            headers = {"retry-after": "1"} if config.error_status == 429 else None
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error", "code": None}},
+                status_code=config.error_status,
+                headers=headers,
+            )
+
+        content = _content(prompt, config.tasks)
+        usage = _usage(prompt, content)
+
+        if not body.get("stream"):
+            await asyncio.sleep(delay)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        stats["streamed"] += 1
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        pieces = [
+            content[i:i + config.stream_chunk_chars]
+            for i in range(0, len(content), config.stream_chunk_chars)
+        ]
+
+        def event(choices: List[Dict[str, Any]], **extra) -> str:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": choices,
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n"
+
+        async def events():
+            await asyncio.sleep(delay * config.first_chunk_share)
+            gap = delay * (1 - config.first_chunk_share) / max(len(pieces), 1)
+            yield event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+            for piece in pieces:
+                yield event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+                await asyncio.sleep(gap)
+            yield event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if include_usage:
+                yield event([], usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_OPENAI_PORT", "8100")))
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="median latency per call")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="log-normal spread; 0 = constant")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail")
+    parser.add_argument("--error-status", type=int, default=500, choices=[429, 500, 502, 503])
+    parser.add_argument("--tasks", type=int, default=5, help="tasks per response (response size)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = FakeConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        tasks=args.tasks,
+    )
+    print(f"fake OpenAI on http://{args.host}:{args.port}/v1 {config}", file=sys.stderr)
+    uvicorn.run(create_app(config, args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
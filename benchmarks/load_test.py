@@ -0,0 +1,221 @@
+"""
+Concurrent mixed-traffic load test against a running API: transcript submissions, task lists,
+filters and single-task patches, reporting throughput and p50/p95/p99 latency per endpoint.
+
+Start the fake OpenAI server and point the API at it, then drive it:
+
+    python benchmarks/fake_openai.py --port 8100 --latency-ms 800 --latency-sigma 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=sk-fake uvicorn main:app --port 8000
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --concurrency 32 --duration 60 \
+        --mix transcript=1 list=4 filter=4 patch=1 --output load-results.json
+
+Every transcript is distinct unless --transcript-pool is set, so the extraction cache only
+helps as much as it would with that many distinct inputs.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.common import environment, make_transcript
+
+DEFAULT_MIX = {"transcript": 1, "list": 4, "filter": 4, "patch": 1}
+ENDPOINTS = {
+    "transcript": "POST /api/transcripts/",
+    "list": "GET /api/tasks/",
+    "filter": "POST /api/tasks/filter",
+    "patch": "PATCH /api/tasks/{task_id}",
+}
+
+FILTERS = [
+    {"status": "pending", "limit": 50},
+    {"priority": "high", "limit": 50},
+    {"keyword": "payment", "limit": 50},
+    {"keyword": "deploy pipeline", "search_mode": "fulltext", "limit": 50},
+    {"tags": ["backend"], "limit": 50},
+]
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, int], transcript_chars: int,
+                 transcript_pool: int, seed: int):
+        self.client = client
+        self.ops = list(mix)
+        self.weights = [mix[op] for op in self.ops]
+        self.transcript_chars = transcript_chars
+        self.transcript_pool = transcript_pool
+        self.seed = seed
+        self.task_ids: List[str] = []
+        self.transcripts_sent = 0
+        # endpoint -> [(latency seconds, status or None on a transport error)]
+        self.samples: Dict[str, List[Tuple[float, Optional[int]]]] = defaultdict(list)
+
+    async def prime(self) -> None:
+        """Collect existing task ids for the patch traffic."""
+        resp = await self.client.get("/api/tasks/", params={"limit": 500})
+        resp.raise_for_status()
+        self.task_ids = [t["id"] for t in resp.json()]
+
+    async def _request(self, op: str, rng: random.Random) -> httpx.Response:
+        if op == "transcript":
+            n = self.transcripts_sent
+            self.transcripts_sent += 1
+            if self.transcript_pool:
+                n %= self.transcript_pool
+            transcript = make_transcript(self.transcript_chars, seed=self.seed * 1_000_003 + n)
+            resp = await self.client.post("/api/transcripts/", json={"transcript": transcript})
+            if resp.status_code == 200:
+                self.task_ids.extend(t["id"] for t in resp.json()["tasks"])
+            return resp
+        if op == "list":
+            return await self.client.get("/api/tasks/", params={"limit": 50})
+        if op == "filter":
+            return await self.client.post("/api/tasks/filter", json=rng.choice(FILTERS))
+        if op == "patch":
+            task_id = rng.choice(self.task_ids)
+            body = {"status": rng.choice(["pending", "completed"]), "priority": rng.choice(["low", "medium", "high"])}
+            return await self.client.patch(f"/api/tasks/{task_id}", json=body)
+        raise ValueError(f"Unknown operation {op!r}")
+
+    async def worker(self, index: int, deadline: float) -> None:
+        rng = random.Random(self.seed * 7919 + index)
+        while time.perf_counter() < deadline:
+            op = rng.choices(self.ops, self.weights)[0]
+            if op == "patch" and not self.task_ids:
+                # nothing to patch yet: run one of the other operations instead
+                others = [(o, w) for o, w in zip(self.ops, self.weights) if o != "patch" and w > 0]
+                if not others:
+                    # a patch-only mix with no tasks: yield so the other workers (and the server) can run
+                    await asyncio.sleep(0.01)
+                    continue
+                op = rng.choices([o for o, _ in others], [w for _, w in others])[0]
+            start = time.perf_counter()
+            try:
+                status: Optional[int] = (await self._request(op, rng)).status_code
+            except httpx.HTTPError:
+                status = None
+            self.samples[ENDPOINTS[op]].append((time.perf_counter() - start, status))
+
+    async def run(self, concurrency: int, duration: float) -> float:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(self.worker(i, deadline) for i in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    if len(ordered) == 1:
+        p50 = p95 = p99 = ordered[0]
+    else:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    return {
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def summarize(samples: Dict[str, List[Tuple[float, Optional[int]]]], elapsed: float) -> List[dict]:
+    """One row per endpoint plus a `total` row: request count, errors, req/s and latency percentiles."""
+    rows = []
+    everything = [s for endpoint in samples for s in samples[endpoint]]
+    for endpoint, points in [*sorted(samples.items()), ("total", everything)]:
+        if not points:
+            continue
+        statuses: Dict[str, int] = defaultdict(int)
+        for _, status in points:
+            statuses[str(status) if status is not None else "transport_error"] += 1
+        rows.append({
+            "endpoint": endpoint,
+            "requests": len(points),
+            "errors": sum(1 for _, status in points if status is None or status >= 400),
+            "rps": round(len(points) / elapsed, 2),
+            **_percentiles([latency for latency, _ in points]),
+            "statuses": dict(statuses),
+        })
+    return rows
+
+
+def _parse_mix(items: Optional[List[str]]) -> Dict[str, int]:
+    if not items:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in items:
+        op, _, weight = item.partition("=")
+        if op not in DEFAULT_MIX or not weight.isdigit():
+            raise SystemExit(f"--mix entries look like transcript=1 (operations: {', '.join(DEFAULT_MIX)})")
+        if int(weight):
+            mix[op] = int(weight)
+    return mix
+
+
+async def run(base_url: str, concurrency: int, duration: float, mix: Dict[str, int],
+              transcript_chars: int = 2000, transcript_pool: int = 0, seed: int = 0) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        test = LoadTest(client, mix, transcript_chars, transcript_pool, seed)
+        await test.prime()
+        elapsed = await test.run(concurrency, duration)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "results": summarize(test.samples, elapsed),
+    }
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=os.getenv("LOAD_BASE_URL", "http://127.0.0.1:8000"))
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--mix", nargs="+", help="operation weights, default: transcript=1 list=4 filter=4 patch=1")
+    parser.add_argument("--transcript-chars", type=int, default=2000)
+    parser.add_argument("--transcript-pool", type=int, default=0, help="cycle this many distinct transcripts; 0 = all distinct")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    mix = _parse_mix(args.mix)
+    report = asyncio.run(run(
+        args.base_url, args.concurrency, args.duration, mix,
+        args.transcript_chars, args.transcript_pool, args.seed,
+    ))
+    report = {
+        "environment": environment(),
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "mix": mix,
+            "transcript_chars": args.transcript_chars,
+            "transcript_pool": args.transcript_pool,
+        },
+        **report,
+    }
+
+    print(f"{'endpoint':<28} {'reqs':>7} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for r in report["results"]:
+        print(
+            f"{r['endpoint']:<28} {r['requests']:>7} {r['errors']:>6} {r['rps']:>8} "
+            f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Run the benchmark suites and write one machine-readable JSON result file.
+
+Offline suites (no services): sanitize, parse, serialize.
+Database suites (need BENCH_DATABASE_URL or DATABASE_URL pointing at a migrated Postgres; skipped
+otherwise): serialize_db, create_tasks, filter_tasks.
+
+    python benchmarks/run.py --output bench-results.json
+    python benchmarks/run.py --suite sanitize parse --quick --compare bench-baseline.json
+
+With --compare, cases whose median is more than --threshold slower than the baseline are listed
+and the exit status is 1, so the runner can gate a release.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# ai_service builds its OpenAI client at import time; no suite calls it
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from benchmarks import bench_create_tasks, bench_filter_tasks, bench_parse, bench_sanitize, bench_serialization
+from benchmarks.common import environment
+
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+
+# name -> (needs database, run(quick) -> results)
+SUITES: Dict[str, Tuple[bool, Callable[[bool], List[dict]]]] = {
+    "sanitize": (False, lambda quick: bench_sanitize.run(
+        [1_000, 10_000] if quick else [1_000, 10_000, 100_000, 1_000_000, 10_000_000], 3 if quick else 5)),
+    "parse": (False, lambda quick: bench_parse.run([5, 50] if quick else [5, 50, 500], 3 if quick else 5)),
+    "serialize": (False, lambda quick: bench_serialization.run_offline(
+        [100, 1000] if quick else [100, 1000, 10000], 3 if quick else 5)),
+    "serialize_db": (True, lambda quick: asyncio.run(bench_serialization.run(
+        [100, 1000] if quick else [100, 1000, 10000], 3 if quick else 5))),
+    "create_tasks": (True, lambda quick: asyncio.run(bench_create_tasks.run(
+        [1, 100] if quick else [1, 10, 100, 1000], 2 if quick else 3))),
+    "filter_tasks": (True, lambda quick: asyncio.run(bench_filter_tasks.run(
+        2000 if quick else 20000, 5 if quick else 20))),
+}
+
+
+# implementation a result is about when it names none (keys stay as they were before "impl" existed)
+DEFAULT_IMPL = "current"
+
+
+def result_key(r: dict) -> Tuple[str, str, int]:
+    impl = r.get("impl")
+    parts = (r.get("case"), impl if impl != DEFAULT_IMPL else None)
+    case = "/".join(part for part in parts if part)
+    return r["benchmark"], case, r["n"]
+
+
+def compare(results: List[dict], baseline: List[dict], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    Human-readable regressions: cases whose median_ms grew by more than `threshold` (0.25 = 25%),
+    and the cases that have no counterpart in `baseline` (so were not checked at all).
+    """
+    before = {result_key(r): r for r in baseline}
+    regressions, unmatched = [], []
+    for r in results:
+        old = before.get(result_key(r))
+        if not old or not old.get("median_ms"):
+            name, case, n = result_key(r)
+            unmatched.append(f"{name}[{case}, n={n}]")
+            continue
+        ratio = r["median_ms"] / old["median_ms"]
+        if ratio > 1 + threshold:
+            name, case, n = result_key(r)
+            regressions.append(
+                f"{name}[{case}, n={n}]: {old['median_ms']} ms -> {r['median_ms']} ms ({ratio:.2f}x)"
+            )
+    return regressions, unmatched
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=list(SUITES), help="default: all available")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, fewer repeats")
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", help="baseline result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results: List[dict] = []
+    skipped: List[str] = []
+    for name in args.suite or list(SUITES):
+        needs_db, run = SUITES[name]
+        if needs_db and not DATABASE_URL:
+            skipped.append(name)
+            print(f"[skip] {name}: no BENCH_DATABASE_URL / DATABASE_URL", file=sys.stderr)
+            continue
+        print(f"[run]  {name}", file=sys.stderr)
+        for r in run(args.quick):
+            results.append({"suite": name, **r})
+
+    report = {"environment": environment(), "quick": args.quick, "skipped": skipped, "results": results}
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions, unmatched = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"[regression] {line}")
+        if unmatched:
+            print(f"[warn] {len(unmatched)} of {len(results)} results have no baseline: {', '.join(unmatched)}",
+                  file=sys.stderr)
+        if results and len(unmatched) == len(results):
+            print(f"[error] nothing in {args.compare} matches these results; was it made by this script?",
+                  file=sys.stderr)
+            return 1
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,30 @@
 import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.log import setup_logging, shutdown_logging
+from app.core.metrics import RequestMetricsMiddleware, metrics_payload
+from app.core.tracing import TracingMiddleware
 from app.api import transcripts, tasks
+from app.services.job_service import job_pool
+
+# JSON logs through a queue: request handlers never block on stdout
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    # Background workers for POST /api/transcripts/jobs (queued jobs survive restarts in the DB)
+    job_pool.start()
+    yield
+    await job_pool.stop()
+    shutdown_logging()
+
 
 # Create FastAPI app
-app = FastAPI(title="InsightBoard AI API")
+app = FastAPI(title="InsightBoard AI API", lifespan=lifespan)
 
 # Configure CORS
 origins = os.getenv(
@@ -19,8 +38,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Per-request trace and Server-Timing header (stages: sanitize, cache, extract, openai, db, persist)
+app.add_middleware(TracingMiddleware)
+
+# Latency histograms + structured access log (added last so it wraps everything, CORS included)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include API routers
 app.include_router(transcripts.router)
 app.include_router(tasks.router)
@@ -30,9 +56,8 @@ app.include_router(tasks.router)
 async def health():
     return {"status": "ok"}
 
-# Optional: Logging requests for debugging
-@app.middleware("http")
-async def log_requests(request, call_next):
-    response = await call_next(request)
-    print(f"{request.method} {request.url} -> {response.status_code}")
-    return response
+# Prometheus scrape endpoint (per process)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)